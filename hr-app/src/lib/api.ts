@@ -0,0 +1,72 @@
+import { goto } from '$app/navigation';
+import { user } from '$lib/stores';
+
+const API_BASE = 'http://127.0.0.1:8000';
+
+// 여러 요청이 동시에 401 을 받아도 재발급은 한 번만 (리프레시 토큰은 1회용)
+let refreshing: Promise<boolean> | null = null;
+
+function clearSession() {
+    localStorage.removeItem('access_token');
+    localStorage.removeItem('refresh_token');
+    localStorage.removeItem('user_id');
+    user.set(null);
+}
+
+async function refreshTokens(): Promise<boolean> {
+    const refreshToken = localStorage.getItem('refresh_token');
+    if (!refreshToken) return false;
+
+    try {
+        const res = await fetch(`${API_BASE}/api/auth/refresh`, {
+            method: 'POST',
+            headers: { 'Content-Type': 'application/json' },
+            body: JSON.stringify({ refresh_token: refreshToken })
+        });
+        if (!res.ok) return false;
+
+        const data = await res.json();
+        localStorage.setItem('access_token', data.access_token);
+        localStorage.setItem('refresh_token', data.refresh_token);
+        return true;
+    } catch {
+        return false;
+    }
+}
+
+// 액세스 토큰을 붙여서 요청하고, 만료(401)되면 리프레시 토큰으로 재발급 후 한 번 더 시도
+export async function authFetch(url: string, init: RequestInit = {}): Promise<Response> {
+    const send = () => {
+        const headers = new Headers(init.headers);
+        const token = localStorage.getItem('access_token');
+        if (token) headers.set('Authorization', `Bearer ${token}`);
+        return fetch(url, { ...init, headers });
+    };
+
+    const res = await send();
+    if (res.status !== 401) return res;
+
+    refreshing ??= refreshTokens().finally(() => { refreshing = null; });
+    if (await refreshing) return send();
+
+    // 리프레시 토큰도 만료/폐기됨 -> 다시 로그인
+    clearSession();
+    goto('/login');
+    return res;
+}
+
+// 로그아웃 (리프레시 토큰만으로도 서버에서 폐기됨, 실패해도 로그아웃은 진행)
+export function logout() {
+    const token = localStorage.getItem('access_token');
+    const refreshToken = localStorage.getItem('refresh_token');
+    if (refreshToken) {
+        const headers: Record<string, string> = { 'Content-Type': 'application/json' };
+        if (token) headers['Authorization'] = `Bearer ${token}`;
+        fetch(`${API_BASE}/api/auth/logout`, {
+            method: 'POST',
+            headers,
+            body: JSON.stringify({ refresh_token: refreshToken })
+        }).catch(() => {});
+    }
+    clearSession();
+}
@@ -0,0 +1,244 @@
+from collections import defaultdict, deque
+from typing import Dict, Optional, Tuple
+import asyncio
+import json
+import math
+import os
+import time
+
+from jose import JWTError, jwt
+
+from routers.auth import ALGORITHM, SECRET_KEY
+
+# ==========================================
+#  수용 제어 (동시 처리 제한 + 요청 속도 제한)
+# ==========================================
+# 출근 시간(8:55~9:05)처럼 요청이 몰릴 때 DB 커넥션 풀이 넘치지 않도록
+# 경로마다 등급을 매겨 동시에 처리할 요청 수를 제한하고, 넘치는 요청은 짧게 줄 세우거나 바로 거절합니다.
+#  - critical   : 출퇴근, 로그인 (가장 먼저 처리, 전체 한도를 모두 사용 가능)
+#  - interactive: 대시보드 등 일반 화면
+#  - report     : 관리자 조회/집계 (전체 한도의 일부만 사용, 몰리면 먼저 거절)
+# 사원/IP 별 토큰 버킷으로 한 사람이 요청을 쏟아내는 것도 막습니다. (429 + Retry-After)
+# 사원 버킷은 서명이 확인된 토큰의 사원에게만 적용 (본문/경로의 사원 ID 는 남이 흉내 낼 수 있으므로 IP 버킷만)
+
+PRIORITY_ORDER = ["critical", "interactive", "report"]
+
+# (메서드, 경로 접두사, 등급) - 위에서부터 먼저 일치하는 규칙 적용. 메서드가 None 이면 전체
+ROUTE_RULES = [
+    ("POST", "/api/attendance/clock-in", "critical"),
+    ("PUT", "/api/attendance/clock-out", "critical"),
+    ("POST", "/api/auth/login", "critical"),
+    ("POST", "/api/auth/refresh", "critical"),
+    (None, "/api/applications/list", "report"),
+    ("GET", "/api/attendance/all", "report"),
+    ("GET", "/api/leaves/schedule", "report"),
+    (None, "/api/analytics", "report"),
+    (None, "/api/payroll", "report"),
+    (None, "/api/audit", "report"),
+]
+
+# 수용 제어를 거치지 않는 경로 (상태 확인, 지표)
+BYPASS_PREFIXES = ("/api/health", "/api/admission/metrics", "/docs", "/openapi.json")
+
+# 프로세스 전체 동시 처리 한도 (DB 커넥션 풀 크기 + overflow 정도로 맞춤)
+GLOBAL_LIMIT = int(os.getenv("HR_MAX_INFLIGHT", 15))
+
+CLASS_LIMITS = {
+    # max_concurrent: 등급별 동시 처리 수 / max_queue: 대기열 길이 / queue_timeout: 대기 최대 시간(초)
+    # global_share: 전체 한도 중 이 등급이 쓸 수 있는 비율 (나머지는 상위 등급 몫으로 남겨둠)
+    "critical": {"max_concurrent": GLOBAL_LIMIT, "max_queue": 500, "queue_timeout": 5.0, "global_share": 1.0},
+    "interactive": {"max_concurrent": GLOBAL_LIMIT, "max_queue": 100, "queue_timeout": 2.0, "global_share": 0.8},
+    "report": {"max_concurrent": 2, "max_queue": 4, "queue_timeout": 1.0, "global_share": 0.3},
+}
+
+# 토큰 버킷 (초당 보충량, 최대 보유량). 사무실 전체가 같은 공인 IP 를 쓰므로 IP 한도는 넉넉하게
+RATE_LIMITS = {
+    "critical": {"employee": (1.0, 5), "ip": (50.0, 300)},
+    "interactive": {"employee": (5.0, 20), "ip": (50.0, 200)},
+    "report": {"employee": (0.5, 3), "ip": (2.0, 6)},
+}
+
+MAX_BUCKETS = 50000
+BUCKET_IDLE_SECONDS = 300
+
+
+def classify(method: str, path: str) -> str:
+    for rule_method, prefix, cls in ROUTE_RULES:
+        if (rule_method is None or rule_method == method) and path.startswith(prefix):
+            return cls
+    return "interactive"
+
+
+# --- 1. 토큰 버킷 ---
+
+class RateLimiter:
+    def __init__(self):
+        self._buckets: Dict[Tuple[str, str], list] = {}  # (등급:종류, 키) -> [남은 토큰, 마지막 갱신 시각]
+
+    def take(self, scope_key: str, key: str, rate: float, burst: int) -> float:
+        """토큰 하나 사용. 성공하면 0, 부족하면 다음 토큰까지 기다릴 초"""
+        now = time.monotonic()
+        bucket = self._buckets.get((scope_key, key))
+        if bucket is None:
+            if len(self._buckets) >= MAX_BUCKETS:
+                self._evict(now)
+            bucket = self._buckets[(scope_key, key)] = [float(burst), now]
+
+        tokens = min(float(burst), bucket[0] + (now - bucket[1]) * rate)
+        bucket[1] = now
+        if tokens >= 1.0:
+            bucket[0] = tokens - 1.0
+            return 0.0
+        bucket[0] = tokens
+        return (1.0 - tokens) / rate
+
+    def _evict(self, now: float):
+        idle = [k for k, (_, updated) in self._buckets.items() if now - updated > BUCKET_IDLE_SECONDS]
+        for k in idle:
+            del self._buckets[k]
+
+
+# --- 2. 등급별 동시 처리 제한 ---
+
+class AdmissionController:
+    def __init__(self):
+        self.inflight = 0
+        self.class_inflight: Dict[str, int] = defaultdict(int)
+        self._waiters: Dict[str, deque] = {c: deque() for c in PRIORITY_ORDER}
+        self.stats: Dict[str, Dict[str, int]] = {
+            c: {"admitted": 0, "queued": 0, "shed": 0, "rate_limited": 0} for c in PRIORITY_ORDER
+        }
+
+    def _can_admit(self, cls: str) -> bool:
+        limits = CLASS_LIMITS[cls]
+        return (self.class_inflight[cls] < limits["max_concurrent"]
+                and self.inflight < GLOBAL_LIMIT * limits["global_share"])
+
+    def _admit(self, cls: str):
+        self.inflight += 1
+        self.class_inflight[cls] += 1
+        self.stats[cls]["admitted"] += 1
+
+    def _higher_or_equal_waiting(self, cls: str) -> bool:
+        for c in PRIORITY_ORDER:
+            if self._waiters[c]:
+                return True
+            if c == cls:
+                return False
+        return False
+
+    async def acquire(self, cls: str) -> bool:
+        # 같은/상위 등급이 줄 서 있으면 새치기하지 않음
+        if not self._higher_or_equal_waiting(cls) and self._can_admit(cls):
+            self._admit(cls)
+            return True
+
+        limits = CLASS_LIMITS[cls]
+        if len(self._waiters[cls]) >= limits["max_queue"]:
+            self.stats[cls]["shed"] += 1
+            return False
+
+        fut = asyncio.get_running_loop().create_future()
+        self._waiters[cls].append(fut)
+        self.stats[cls]["queued"] += 1
+        try:
+            await asyncio.wait_for(fut, limits["queue_timeout"])
+            return True  # release() 에서 이미 _admit 처리됨
+        except asyncio.TimeoutError:
+            if fut.done() and not fut.cancelled():
+                return True  # 시간 초과 직전에 자리를 받은 경우
+            try:
+                self._waiters[cls].remove(fut)
+            except ValueError:
+                pass
+            self.stats[cls]["shed"] += 1
+            return False
+
+    def release(self, cls: str):
+        self.inflight -= 1
+        self.class_inflight[cls] -= 1
+        # 자리가 나면 높은 등급 대기자부터 깨움
+        for c in PRIORITY_ORDER:
+            waiters = self._waiters[c]
+            while waiters and self._can_admit(c):
+                fut = waiters.popleft()
+                if fut.done():
+                    continue  # 이미 시간 초과로 포기한 요청
+                self._admit(c)
+                fut.set_result(True)
+
+    def metrics(self) -> dict:
+        return {
+            "inflight": self.inflight,
+            "globalLimit": GLOBAL_LIMIT,
+            "classes": {
+                c: {
+                    **self.stats[c],
+                    "inflight": self.class_inflight[c],
+                    "queueDepth": len(self._waiters[c]),
+                }
+                for c in PRIORITY_ORDER
+            },
+        }
+
+
+# --- 3. ASGI 미들웨어 ---
+
+def _bearer_subject(headers: dict) -> Optional[str]:
+    """Authorization 헤더의 JWT 서명/만료를 확인하고 sub 를 꺼냄 (폐기 여부는 라우터에서 확인)"""
+    auth = headers.get(b"authorization", b"").decode("latin-1")
+    if not auth.lower().startswith("bearer "):
+        return None
+    try:
+        return jwt.decode(auth[7:], SECRET_KEY, algorithms=[ALGORITHM]).get("sub")
+    except JWTError:
+        return None
+
+
+async def _reject(send, status: int, detail: str, retry_after: float):
+    body = json.dumps({"detail": detail}, ensure_ascii=False).encode("utf-8")
+    await send({
+        "type": "http.response.start",
+        "status": status,
+        "headers": [
+            (b"content-type", b"application/json"),
+            (b"content-length", str(len(body)).encode()),
+            (b"retry-after", str(max(1, math.ceil(retry_after))).encode()),
+        ],
+    })
+    await send({"type": "http.response.body", "body": body})
+
+
+class AdmissionMiddleware:
+    def __init__(self, app, controller: Optional[AdmissionController] = None, limiter: Optional[RateLimiter] = None):
+        self.app = app
+        self.controller = controller or admission_controller
+        self.limiter = limiter or rate_limiter
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or scope["method"] == "OPTIONS" or scope["path"].startswith(BYPASS_PREFIXES):
+            return await self.app(scope, receive, send)
+
+        cls = classify(scope["method"], scope["path"])
+        employee_id = _bearer_subject(dict(scope["headers"]))
+        client_ip = (scope.get("client") or ("-", 0))[0]
+        limits = RATE_LIMITS[cls]
+        wait = self.limiter.take(f"{cls}:ip", client_ip, *limits["ip"])
+        if not wait and employee_id:
+            wait = self.limiter.take(f"{cls}:employee", employee_id, *limits["employee"])
+        if wait:
+            self.controller.stats[cls]["rate_limited"] += 1
+            return await _reject(send, 429, "요청이 너무 많습니다. 잠시 후 다시 시도하세요.", wait)
+
+        if not await self.controller.acquire(cls):
+            return await _reject(send, 503, "요청이 몰려 처리할 수 없습니다. 잠시 후 다시 시도하세요.", 1)
+
+        try:
+            await self.app(scope, receive, send)
+        finally:
+            self.controller.release(cls)
+
+
+# 앱 전체에서 공유 (워커 프로세스마다 하나)
+admission_controller = AdmissionController()
+rate_limiter = RateLimiter()
@@ -0,0 +1,233 @@
+from datetime import date, datetime
+from typing import List, Optional
+import argparse
+import logging
+import os
+
+from sqlalchemy.orm import Session
+
+import database
+import models
+
+logger = logging.getLogger(__name__)
+
+# ==========================================
+#  연도별 콜드 아카이브 (Parquet)
+# ==========================================
+# 마감된 연도의 출퇴근/신청서 데이터를 archive/<테이블>/<연도>.parquet 로 옮기고
+# 핫 테이블에서는 삭제합니다. 과거 연도 조회는 이 파일을 투명하게 읽습니다.
+
+ARCHIVE_DIR = os.getenv("HR_ARCHIVE_DIR", os.path.join(os.path.dirname(os.path.abspath(__file__)), "archive"))
+
+DELETE_BATCH_SIZE = 1000
+
+# 결재가 끝나지 않은 신청서는 연도가 지나도 핫 테이블에 남겨 둠 (상태 변경 API 가 찾을 수 있도록)
+OPEN_APPLICATION_STATUSES = ("대기",)
+
+# 테이블별 (모델, 파티션 키 컬럼, 컬럼 목록)
+PARTITIONS = {
+    "attendance": (models.Attendance, models.Attendance.attendance_date, [
+        "attendance_id", "employee_id", "attendance_date",
+        "attendance_in_time", "attendance_out_time",
+        "attendance_in_location", "attendance_out_location", "attendance_method",
+    ]),
+    "applications": (models.ApplicationModel, models.ApplicationModel.start_date, [
+        "application_id", "employee_id", "application_type",
+        "start_date", "end_date", "reason", "status", "created_at",
+    ]),
+}
+
+
+def _arrow():
+    """pyarrow 는 아카이브를 쓰거나 읽을 때만 필요 (서버 기동이 느려지지 않도록 그때 import)"""
+    try:
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+    except ImportError:
+        return None, None
+    return pa, pq
+
+
+def _schema(pa, table: str):
+    if table == "attendance":
+        return pa.schema([
+            ("attendance_id", pa.string()),
+            ("employee_id", pa.string()),
+            ("attendance_date", pa.date32()),
+            ("attendance_in_time", pa.time64("us")),
+            ("attendance_out_time", pa.time64("us")),
+            ("attendance_in_location", pa.string()),
+            ("attendance_out_location", pa.string()),
+            ("attendance_method", pa.string()),
+        ])
+    return pa.schema([
+        ("application_id", pa.string()),
+        ("employee_id", pa.string()),
+        ("application_type", pa.string()),
+        ("start_date", pa.timestamp("us")),
+        ("end_date", pa.timestamp("us")),
+        ("reason", pa.string()),
+        ("status", pa.string()),
+        ("created_at", pa.timestamp("us")),
+    ])
+
+
+def partition_path(table: str, year: int) -> str:
+    return os.path.join(ARCHIVE_DIR, table, f"{year}.parquet")
+
+
+def is_archived(table: str, year: int) -> bool:
+    return os.path.exists(partition_path(table, year))
+
+
+def archived_years(table: str, start: date, end: date) -> List[int]:
+    """조회 기간 중 아카이브로 옮겨진 연도 목록"""
+    return [y for y in range(start.year, end.year + 1) if is_archived(table, y)]
+
+
+def all_archived_years(table: str) -> List[int]:
+    """아카이브로 옮겨진 모든 연도 (기간 없이 누적하는 값 계산용)"""
+    table_dir = os.path.join(ARCHIVE_DIR, table)
+    if not os.path.isdir(table_dir):
+        return []
+    return sorted(int(name[:-8]) for name in os.listdir(table_dir) if name.endswith(".parquet") and name[:-8].isdigit())
+
+
+# --- 1. 아카이브 읽기 ---
+
+def _read(table: str, start, end, employee_id: Optional[str] = None, status: Optional[str] = None) -> list:
+    years = archived_years(table, start, end)
+    if not years:
+        return []
+    _, pq = _arrow()
+    if pq is None:
+        raise RuntimeError("아카이브 데이터를 읽으려면 pyarrow 가 필요합니다.")
+
+    model, key, _ = PARTITIONS[table]
+    filters = [(key.key, ">=", start), (key.key, "<=", end)]
+    if employee_id:
+        filters.append(("employee_id", "=", employee_id))
+    if status:
+        filters.append(("status", "=", status))
+
+    rows = []
+    for year in years:
+        for row in pq.read_table(partition_path(table, year), filters=filters).to_pylist():
+            # 세션에 붙이지 않은 모델 객체로 돌려주어 핫 테이블 조회 결과와 똑같이 다룰 수 있게 함
+            rows.append(model(**row))
+    return rows
+
+
+def read_attendance(start: date, end: date, employee_id: Optional[str] = None) -> List[models.Attendance]:
+    """아카이브된 연도의 출퇴근 기록 (attendance_date 기준)"""
+    return _read("attendance", start, end, employee_id)
+
+
+def read_applications(start: datetime, end: datetime, employee_id: Optional[str] = None) -> List[models.ApplicationModel]:
+    """아카이브된 연도의 신청서 (start_date 기준)"""
+    return _read("applications", start, end, employee_id)
+
+
+def read_employee_applications(employee_id: str, status: Optional[str] = None) -> List[models.ApplicationModel]:
+    """한 사원의 아카이브된 신청서 전체 (연차 사용량처럼 연도 구분 없이 누적하는 값 계산용)"""
+    years = all_archived_years("applications")
+    if not years:
+        return []
+    return _read("applications", datetime(years[0], 1, 1), datetime(years[-1], 12, 31, 23, 59, 59, 999999), employee_id, status)
+
+
+def employee_applications(db: Session, employee_id: str, status: Optional[str] = None) -> List[models.ApplicationModel]:
+    """핫 테이블과 아카이브를 합친 한 사원의 신청서 (양쪽에 같은 행이 있으면 핫 테이블 것을 씀)"""
+    q = db.query(models.ApplicationModel).filter(models.ApplicationModel.employee_id == employee_id)
+    if status:
+        q = q.filter(models.ApplicationModel.status == status)
+    merged = {a.application_id: a for a in read_employee_applications(employee_id, status)}
+    merged.update((a.application_id, a) for a in q.all())
+    return list(merged.values())
+
+
+# --- 2. 아카이브 쓰기 ---
+
+def archive_year(db: Session, table: str, year: int) -> int:
+    """한 해 분량을 Parquet 로 옮기고 핫 테이블에서 삭제. 옮긴 행 수를 리턴"""
+    pa, pq = _arrow()
+    if pq is None:
+        raise RuntimeError("아카이브를 만들려면 pyarrow 가 필요합니다. (pip install pyarrow)")
+    if year >= date.today().year:
+        raise ValueError(f"{year}년은 아직 마감되지 않은 연도입니다.")
+
+    model, key, columns = PARTITIONS[table]
+    if table == "attendance":
+        year_start, year_end = date(year, 1, 1), date(year, 12, 31)
+    else:
+        year_start, year_end = datetime(year, 1, 1), datetime(year, 12, 31, 23, 59, 59, 999999)
+
+    q = db.query(model).filter(key.between(year_start, year_end))
+    if table == "applications":
+        q = q.filter(model.status.notin_(OPEN_APPLICATION_STATUSES))
+    rows = q.order_by(key.asc()).all()
+    if not rows:
+        return 0
+
+    # 이미 아카이브된 연도에 늦게 들어온 데이터가 있으면 기존 파일과 합쳐서 다시 씀
+    # (지난번 실행이 파일 교체 후 DB 삭제에서 실패했다면 같은 행이 양쪽에 있으므로 기본 키로 중복 제거)
+    pk = model.__mapper__.primary_key[0]
+    records = [{c: getattr(r, c) for c in columns} for r in rows]
+    archived_ids = [rec[pk.key] for rec in records]
+    path = partition_path(table, year)
+    if os.path.exists(path):
+        merged = {rec[pk.key]: rec for rec in pq.read_table(path).to_pylist()}
+        merged.update((rec[pk.key], rec) for rec in records)
+        records = list(merged.values())
+
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    tmp_path = path + ".tmp"
+    pq.write_table(pa.Table.from_pylist(records, schema=_schema(pa, table)), tmp_path, compression="zstd")
+
+    # 파일이 온전히 써졌는지 확인한 뒤에만 교체 + 삭제
+    if pq.ParquetFile(tmp_path).metadata.num_rows != len(records):
+        os.remove(tmp_path)
+        raise RuntimeError(f"{table} {year}년 아카이브 검증 실패")
+    os.replace(tmp_path, path)
+
+    # 조회 이후에 들어온 행이 아카이브 없이 지워지지 않도록 기간이 아니라 옮긴 행의 기본 키로 삭제
+    try:
+        for i in range(0, len(archived_ids), DELETE_BATCH_SIZE):
+            db.query(model).filter(pk.in_(archived_ids[i:i + DELETE_BATCH_SIZE])).delete(synchronize_session=False)
+        db.commit()
+    except Exception:
+        db.rollback()
+        raise
+
+    logger.info("%s %d년 %d건 아카이브 완료 -> %s", table, year, len(rows), path)
+    return len(rows)
+
+
+def archive_closed_years(db: Session, keep_years: int = 1) -> dict:
+    """올해를 포함한 최근 keep_years 년을 제외한 모든 연도를 아카이브"""
+    cutoff = date.today().year - max(keep_years, 1)
+    result = {}
+    for table, (model, key, _) in PARTITIONS.items():
+        oldest = db.query(key).order_by(key.asc()).first()
+        if not oldest or oldest[0] is None:
+            continue
+        for year in range(oldest[0].year, cutoff + 1):
+            moved = archive_year(db, table, year)
+            if moved:
+                result[f"{table}/{year}"] = moved
+    return result
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO)
+
+    parser = argparse.ArgumentParser(description="마감된 연도의 출퇴근/신청서 데이터를 Parquet 아카이브로 이동")
+    parser.add_argument("--keep-years", type=int, default=1, help="핫 테이블에 남겨둘 최근 연도 수 (올해 포함)")
+    args = parser.parse_args()
+
+    db = database.SessionLocal()
+    try:
+        moved = archive_closed_years(db, keep_years=args.keep_years)
+        print(f"✅ 아카이브 완료: {moved if moved else '옮길 데이터 없음'}")
+    finally:
+        db.close()
@@ -0,0 +1,213 @@
+from datetime import date, datetime, time as dtime
+from typing import List, Optional
+import atexit
+import json
+import logging
+import os
+import threading
+
+from sqlalchemy import event, inspect
+from sqlalchemy.orm import Session
+
+import database
+import models
+
+logger = logging.getLogger(__name__)
+
+# ==========================================
+#  감사 로그 (누가 무엇을 어떻게 바꿨는지)
+# ==========================================
+# 세션 이벤트로 신청서/출퇴근/사원 정보의 변경 전후 값을 잡아 두었다가 커밋된 것만 메모리 버퍼에 넣고,
+# 별도 스레드가 건수/시간 기준으로 모아서 한 번에 INSERT 합니다. (요청마다 INSERT 를 추가하지 않음)
+# DB 에 쓸 수 없으면 append-only 스풀 파일에 남겨 두고, 다음 flush 때 먼저 옮겨 씁니다.
+
+AUDITED_MODELS = (models.ApplicationModel, models.Attendance, models.Employee)
+MASKED_FIELDS = {"password"}
+
+FLUSH_BATCH_SIZE = int(os.getenv("HR_AUDIT_BATCH_SIZE", 200))
+FLUSH_INTERVAL_SECONDS = float(os.getenv("HR_AUDIT_FLUSH_SECONDS", 2.0))
+SPOOL_PATH = os.getenv("HR_AUDIT_SPOOL", os.path.join(os.path.dirname(os.path.abspath(__file__)), "audit_spool.jsonl"))
+
+_PENDING_KEY = "pending_audit"
+ACTOR_KEY = "actor_id"  # session.info 에 넣어 두면 변경자로 기록 (get_current_user 에서 설정)
+
+
+def _plain(value):
+    if isinstance(value, (datetime, date, dtime)):
+        return value.isoformat()
+    return value
+
+
+class AuditWriter:
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._flush_lock = threading.Lock()
+        self._buffer: List[dict] = []
+        self._wakeup = threading.Event()
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    # --- 기록 ---
+
+    def add(self, entries: List[dict]):
+        if not entries:
+            return
+        with self._lock:
+            self._buffer.extend(entries)
+            full = len(self._buffer) >= FLUSH_BATCH_SIZE
+        if full:
+            self._wakeup.set()
+        # 커밋 훅 안에서 불리므로 여기서 바로 기록하지 않음 (SQLite 쓰기 잠금을 아직 들고 있음)
+        # 워커 스레드가 없으면(배치 작업/스크립트) stop() / 종료 시점 flush 에서 기록
+
+    def record(self, action: str, employee_id: Optional[str], actor_id: Optional[str] = None,
+               entity: str = "auth", entity_id: Optional[str] = None, changes: Optional[dict] = None):
+        """세션 밖에서 일어나는 이벤트(로그인 등) 기록"""
+        self.add([{
+            "occurred_at": datetime.now(),
+            "actor_id": actor_id,
+            "employee_id": employee_id,
+            "action": action,
+            "entity": entity,
+            "entity_id": entity_id or employee_id,
+            "changes": json.dumps(changes or {}, ensure_ascii=False, default=str),
+        }])
+
+    # --- flush ---
+
+    def flush(self):
+        with self._flush_lock:
+            with self._lock:
+                rows, self._buffer = self._buffer, []
+
+            try:
+                self._replay_spool()
+                if rows:
+                    self._insert(rows)
+            except Exception as e:
+                if rows:
+                    logger.warning("감사 로그 %d건 DB 기록 실패, 스풀 파일에 보관: %s", len(rows), e)
+                    self._spool(rows)
+
+    def _insert(self, rows: List[dict]):
+        # executemany 로 여러 행을 한 번에 INSERT
+        if database.IS_SQLITE:
+            with database._write_lock, database.engine.begin() as conn:
+                conn.execute(models.AuditLog.__table__.insert(), rows)
+            return
+        with database.engine.begin() as conn:
+            conn.execute(models.AuditLog.__table__.insert(), rows)
+
+    def _spool(self, rows: List[dict]):
+        if not rows:
+            return
+        with open(SPOOL_PATH, "a", encoding="utf-8") as f:
+            for row in rows:
+                f.write(json.dumps({**row, "occurred_at": row["occurred_at"].isoformat()}, ensure_ascii=False) + "\n")
+            f.flush()
+            os.fsync(f.fileno())
+
+    def _replay_spool(self):
+        replay_path = SPOOL_PATH + ".replay"
+        if not os.path.exists(replay_path):
+            if not os.path.exists(SPOOL_PATH):
+                return
+            # 옮겨 쓰는 동안 새로 스풀되는 행과 섞이지 않도록 파일을 떼어 냄
+            os.replace(SPOOL_PATH, replay_path)
+
+        with open(replay_path, encoding="utf-8") as f:
+            rows = [json.loads(line) for line in f if line.strip()]
+        for row in rows:
+            row["occurred_at"] = datetime.fromisoformat(row["occurred_at"])
+        if rows:
+            self._insert(rows)
+        os.remove(replay_path)
+        logger.info("스풀된 감사 로그 %d건을 DB 로 옮겼습니다.", len(rows))
+
+    # --- 백그라운드 스레드 ---
+
+    def _loop(self):
+        while not self._stop.is_set():
+            self._wakeup.wait(FLUSH_INTERVAL_SECONDS)
+            self._wakeup.clear()
+            self.flush()
+
+    def start(self):
+        if self._thread is None:
+            self._stop.clear()
+            self._thread = threading.Thread(target=self._loop, name="hr-audit-writer", daemon=True)
+            self._thread.start()
+
+    def stop(self):
+        """남은 버퍼를 기록하고 종료 (DB 가 안 되면 스풀 파일로)"""
+        self._stop.set()
+        self._wakeup.set()
+        if self._thread is not None:
+            self._thread.join(timeout=FLUSH_INTERVAL_SECONDS * 2)
+            self._thread = None
+        self.flush()
+
+
+# 앱 전체에서 공유하는 감사 로그 writer
+audit_writer = AuditWriter()
+atexit.register(audit_writer.flush)
+
+
+# --- 세션 이벤트로 변경 내용 수집 (커밋된 것만 기록) ---
+
+def _entry(session: Session, obj, action: str) -> Optional[dict]:
+    state = inspect(obj)
+    mapper = state.mapper
+    changes = {}
+    for attr in mapper.column_attrs:
+        key = attr.key
+        history = state.attrs[key].history
+        if action == "update":
+            if not history.has_changes():
+                continue
+            old = history.deleted[0] if history.deleted else None
+            new = history.added[0] if history.added else None
+        elif action == "insert":
+            old, new = None, getattr(obj, key)
+            if new is None:
+                continue
+        else:
+            old, new = getattr(obj, key), None
+        if key in MASKED_FIELDS:
+            old, new = ("***" if old is not None else None), ("***" if new is not None else None)
+        changes[key] = [_plain(old), _plain(new)]
+
+    if action == "update" and not changes:
+        return None
+
+    entity_id = ",".join(str(getattr(obj, c.key)) for c in mapper.primary_key)
+    return {
+        "occurred_at": datetime.now(),
+        "actor_id": session.info.get(ACTOR_KEY),
+        "employee_id": getattr(obj, "employee_id", None),
+        "action": action,
+        "entity": mapper.local_table.name,
+        "entity_id": entity_id,
+        "changes": json.dumps(changes, ensure_ascii=False, default=str),
+    }
+
+
+@event.listens_for(database.SessionLocal, "before_flush")
+def _collect_audit_entries(session: Session, flush_context, instances):
+    pending = session.info.setdefault(_PENDING_KEY, [])
+    for objs, action in ((session.new, "insert"), (session.dirty, "update"), (session.deleted, "delete")):
+        for obj in objs:
+            if isinstance(obj, AUDITED_MODELS):
+                entry = _entry(session, obj, action)
+                if entry:
+                    pending.append(entry)
+
+
+@event.listens_for(database.SessionLocal, "after_commit")
+def _buffer_audit_entries(session: Session):
+    audit_writer.add(session.info.pop(_PENDING_KEY, []))
+
+
+@event.listens_for(database.SessionLocal, "after_soft_rollback")
+def _drop_audit_entries(session: Session, previous_transaction):
+    session.info.pop(_PENDING_KEY, None)
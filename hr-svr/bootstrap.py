@@ -0,0 +1,286 @@
+from contextlib import contextmanager
+from datetime import datetime
+from typing import Callable, Dict, Optional
+import logging
+import os
+import threading
+import time
+
+from sqlalchemy import inspect, text
+from sqlalchemy.exc import SQLAlchemyError
+
+import database
+import models
+import workdays
+from directory import employee_directory
+from revocation import revocation_list
+
+logger = logging.getLogger(__name__)
+
+# ==========================================
+#  서버 기동 / 준비 상태
+# ==========================================
+# import 시점에는 DB 에 접속하지 않습니다. 워커는 바로 요청을 받을 수 있는 상태로 뜨고,
+# 백그라운드 스레드가 스키마 확인 -> 커넥션 풀 예열 -> 캐시 적재를 마치면 ready 로 바뀝니다.
+# DB 가 잠시 내려가 있어도 워커가 죽지 않고 재시도합니다.
+
+# 모델(테이블/컬럼/인덱스)을 바꾸면 1 올리고 MIGRATIONS 에 그 버전의 단계를 추가할 것.
+# create_all 은 없는 테이블만 만들고 기존 테이블은 건드리지 않으므로, 기존 테이블의 컬럼/인덱스 변경은
+# 반드시 마이그레이션 단계(ALTER TABLE / CREATE INDEX)로 적어야 함
+SCHEMA_VERSION = 5
+
+SCHEMA_LOCK_NAME = "hr_schema_migration"
+# 버전이 맞으면 테이블을 reflect 하지 않음 (워커마다 기동이 느려지지 않도록). 배포 점검 때만 HR_VERIFY_SCHEMA=1
+VERIFY_SCHEMA_ON_BOOT = os.getenv("HR_VERIFY_SCHEMA", "0") == "1"
+RETRY_MAX_SECONDS = 30
+
+
+class Readiness:
+    def __init__(self):
+        self.ready = False
+        self.steps = {"schema": False, "pool": False, "holidays": False, "directory": False, "revocations": False}
+        self.error: Optional[str] = None
+        self.started_at = time.monotonic()
+        self.ready_in_ms: Optional[float] = None
+
+    def mark(self, step: str):
+        self.steps[step] = True
+
+    def to_dict(self) -> dict:
+        return {
+            "status": "ready" if self.ready else "starting",
+            "steps": dict(self.steps),
+            "readyInMs": self.ready_in_ms,
+            "error": self.error,
+        }
+
+
+readiness = Readiness()
+_stop = threading.Event()
+
+
+# --- 1. 스키마 확인 (버전 스탬프) ---
+
+def _read_schema_version(conn) -> int:
+    try:
+        row = conn.execute(text("SELECT MAX(version) FROM schema_version")).first()
+    except SQLAlchemyError:
+        conn.rollback()
+        return 0  # 테이블이 아직 없음
+    return row[0] or 0
+
+
+@contextmanager
+def _schema_lock(conn):
+    """여러 워커가 동시에 떠도 스키마 생성은 한 워커만 하도록 잠금"""
+    if database.IS_SQLITE:
+        try:
+            import fcntl
+        except ImportError:  # Windows: SQLite 는 보통 워커 하나로 운영
+            yield
+            return
+        with open(database.SQLITE_PATH + ".lock", "w") as f:
+            fcntl.flock(f, fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                fcntl.flock(f, fcntl.LOCK_UN)
+        return
+
+    conn.execute(text("SELECT GET_LOCK(:name, 60)"), {"name": SCHEMA_LOCK_NAME})
+    try:
+        yield
+    finally:
+        conn.execute(text("SELECT RELEASE_LOCK(:name)"), {"name": SCHEMA_LOCK_NAME})
+
+
+# --- 버전별 마이그레이션 단계 ---
+# create_all 직후에 실행. 새로 만든 DB 에서도 돌 수 있도록 여러 번 실행해도 안전해야 함
+# 새 테이블만 추가한 버전(1: 휴일/월 마감/토큰 폐기/스키마 버전, 2: 감사 로그)은 create_all 로 충분하므로 단계 없음
+
+def _add_column(conn, column):
+    if column.name in {c["name"] for c in inspect(conn).get_columns(column.table.name)}:
+        return
+    col_type = column.type.compile(dialect=conn.dialect)
+    conn.execute(text(f"ALTER TABLE {column.table.name} ADD COLUMN {column.name} {col_type}"))
+
+
+def _create_index(conn, table: str, name: str, columns: list, unique: bool = False):
+    """같은 컬럼 조합의 인덱스/유니크 제약이 이미 있으면 건너뜀 (create_all 로 만든 DB 는 이름이 다를 수 있음)"""
+    inspector = inspect(conn)
+    existing = [(i["column_names"], bool(i.get("unique"))) for i in inspector.get_indexes(table)]
+    existing += [(u["column_names"], True) for u in inspector.get_unique_constraints(table)]
+    if any(cols == columns and (is_unique or not unique) for cols, is_unique in existing):
+        return
+    conn.execute(text(f"CREATE {'UNIQUE ' if unique else ''}INDEX {name} ON {table} ({', '.join(columns)})"))
+
+
+def _migrate_3(conn):
+    """기존 테이블에 추가한 컬럼/인덱스 (연도별 범위 조회 인덱스, 중복 출근 방지, Idempotency-Key)"""
+    _create_index(conn, "attendance", "ix_attendance_date_employee", ["attendance_date", "employee_id"])
+    _create_index(conn, "applications", "ix_applications_start_employee", ["start_date", "employee_id"])
+
+    duplicate = conn.execute(text(
+        "SELECT employee_id, attendance_date FROM attendance "
+        "GROUP BY employee_id, attendance_date HAVING COUNT(*) > 1"
+    )).first()
+    if duplicate:
+        raise RuntimeError(
+            f"같은 날 출근 기록이 두 건 이상 있어 유니크 인덱스를 만들 수 없습니다. "
+            f"정리 후 다시 시작하세요. (예: {duplicate[0]} {duplicate[1]})"
+        )
+    _create_index(conn, "attendance", "uq_attendance_employee_date", ["employee_id", "attendance_date"], unique=True)
+
+    _add_column(conn, models.ApplicationModel.__table__.c.idempotency_key)
+    _create_index(conn, "applications", "uq_applications_idempotency_key", ["idempotency_key"], unique=True)
+
+
+def _migrate_4(conn):
+    """토큰 폐기 기록: jti 유니크 (리프레시 토큰 재사용 감지), 증분 동기화용 revoked_at 인덱스"""
+    table = "token_revocations"
+    jti_index = next((i for i in inspect(conn).get_indexes(table) if i["name"] == "ix_token_revocations_jti"), None)
+    if jti_index is not None and not jti_index.get("unique"):
+        # 이전에 동시 재발급으로 중복 기록된 jti 는 하나만 남김
+        conn.execute(text(
+            "DELETE FROM token_revocations WHERE jti IS NOT NULL AND id NOT IN "
+            "(SELECT id FROM (SELECT MIN(id) AS id FROM token_revocations WHERE jti IS NOT NULL GROUP BY jti) keep)"
+        ))
+        drop = "DROP INDEX ix_token_revocations_jti"
+        conn.execute(text(drop if database.IS_SQLITE else f"{drop} ON {table}"))
+    _create_index(conn, table, "ix_token_revocations_jti", ["jti"], unique=True)
+    _create_index(conn, table, "ix_token_revocations_revoked_at", ["revoked_at"])
+
+
+def _migrate_5(conn):
+    """사원 updated_at (다른 워커의 사원 디렉터리 동기화용). SQL 로 직접 바꿔도 갱신되도록 DB 에서도 설정"""
+    _add_column(conn, models.Employee.__table__.c.updated_at)
+    conn.execute(text("UPDATE employees SET updated_at = CURRENT_TIMESTAMP WHERE updated_at IS NULL"))
+    _create_index(conn, "employees", "ix_employees_updated_at", ["updated_at"])
+    if database.IS_SQLITE:
+        conn.execute(text(
+            "CREATE TRIGGER IF NOT EXISTS trg_employees_updated_at AFTER UPDATE ON employees "
+            "WHEN NEW.updated_at IS OLD.updated_at BEGIN "
+            "UPDATE employees SET updated_at = CURRENT_TIMESTAMP WHERE employee_id = NEW.employee_id; END"
+        ))
+    else:
+        conn.execute(text(
+            "ALTER TABLE employees MODIFY updated_at DATETIME NOT NULL "
+            "DEFAULT CURRENT_TIMESTAMP ON UPDATE CURRENT_TIMESTAMP"
+        ))
+
+
+MIGRATIONS: Dict[int, Callable] = {
+    3: _migrate_3,
+    4: _migrate_4,
+    5: _migrate_5,
+}
+
+
+def _verify_schema(conn):
+    """모델에 있는 컬럼이 실제 테이블에 모두 있는지 확인 (없으면 준비 실패로 처리)"""
+    inspector = inspect(conn)
+    missing = []
+    for table in models.Base.metadata.sorted_tables:
+        existing = {c["name"] for c in inspector.get_columns(table.name)}
+        missing += [f"{table.name}.{c.name}" for c in table.columns if c.name not in existing]
+    if missing:
+        raise RuntimeError(f"DB 스키마가 모델과 다릅니다. 없는 컬럼: {', '.join(missing)}")
+
+
+def ensure_schema() -> bool:
+    """DB 의 스키마 버전부터 SCHEMA_VERSION 까지 마이그레이션 실행. 실제로 실행했으면 True"""
+    with database.engine.connect() as conn:
+        if _read_schema_version(conn) >= SCHEMA_VERSION:
+            if VERIFY_SCHEMA_ON_BOOT:
+                _verify_schema(conn)
+            return False
+
+        with _schema_lock(conn):
+            # 잠금을 기다리는 사이 다른 워커가 끝냈을 수 있으므로 다시 확인 (마이그레이션한 워커가 이미 검증함)
+            current = _read_schema_version(conn)
+            if current >= SCHEMA_VERSION:
+                return False
+
+            models.Base.metadata.create_all(bind=conn)
+            conn.commit()
+            for version in range(current + 1, SCHEMA_VERSION + 1):
+                if version in MIGRATIONS:
+                    MIGRATIONS[version](conn)
+                conn.execute(
+                    models.SchemaVersion.__table__.insert(),
+                    {"version": version, "applied_at": datetime.now()},
+                )
+                conn.commit()
+                logger.info("DB 스키마 마이그레이션 %d 적용", version)
+            _verify_schema(conn)
+
+    logger.info("DB 스키마를 버전 %d 로 맞췄습니다.", SCHEMA_VERSION)
+    return True
+
+
+# --- 2. 예열 ---
+
+def warm_pool():
+    """커넥션 풀을 미리 채워 첫 요청들이 접속 비용을 내지 않도록 함"""
+    size = 1 if database.IS_SQLITE else database.engine.pool.size()
+    conns = []
+    try:
+        for _ in range(size):
+            conn = database.engine.connect()
+            conn.execute(text("SELECT 1"))
+            conns.append(conn)
+    finally:
+        for conn in conns:
+            conn.close()
+
+
+def warm_caches():
+    db = database.SessionLocal()
+    try:
+        workdays.load_holidays(db)
+        workdays.start_sync()
+        readiness.mark("holidays")
+        employee_directory.load(db)
+        employee_directory.start()
+        readiness.mark("directory")
+    finally:
+        db.close()
+    revocation_list.start()
+    readiness.mark("revocations")
+
+
+def _warm_up():
+    delay = 1.0
+    while not _stop.is_set():
+        try:
+            ensure_schema()
+            readiness.mark("schema")
+            warm_pool()
+            readiness.mark("pool")
+            warm_caches()
+        except Exception as e:
+            readiness.error = str(e)
+            logger.warning("기동 준비 실패, %.0f초 후 재시도: %s", delay, e)
+            _stop.wait(delay)
+            delay = min(delay * 2, RETRY_MAX_SECONDS)
+            continue
+
+        readiness.error = None
+        readiness.ready = True
+        readiness.ready_in_ms = round((time.monotonic() - readiness.started_at) * 1000, 1)
+        logger.info("서버 준비 완료 (%.1fms)", readiness.ready_in_ms)
+        return
+
+
+def start():
+    """기동 준비를 백그라운드로 시작 (바로 리턴)"""
+    _stop.clear()
+    readiness.started_at = time.monotonic()
+    threading.Thread(target=_warm_up, name="hr-warm-up", daemon=True).start()
+
+
+def stop():
+    _stop.set()
+    workdays.stop_sync()
+    employee_directory.stop()
+    revocation_list.stop()
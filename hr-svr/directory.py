@@ -0,0 +1,183 @@
+from datetime import datetime, timedelta
+from typing import Dict, Iterable, List, Optional, Tuple
+import logging
+import os
+import threading
+
+from sqlalchemy import event, func, select
+from sqlalchemy.orm import Session
+
+import database
+import models
+
+logger = logging.getLogger(__name__)
+
+# ==========================================
+#  사원 디렉터리 (메모리 캐시)
+# ==========================================
+# 목록 API 가 이름/부서/직급만 얻으려고 employees 를 조인하지 않도록,
+# 서버 시작 시 전체 사원을 읽어 두고 사원 정보가 커밋될 때마다 바뀐 행만 반영합니다.
+# 다른 워커에서 추가된 사원처럼 캐시에 없는 id 는 조회 시 한 번에 모아서 DB 에서 읽습니다.
+# 다른 워커(또는 SQL 로 직접)에서 바뀐 사원은 updated_at 기준으로 짧은 주기마다 가져와 반영합니다.
+# (퇴사 처리가 모든 워커의 로그인 확인에 반영되도록)
+
+FIELDS = (
+    "employee_id", "name", "department", "position", "email",
+    "phone_number", "hire_date", "status", "total_leave_days",
+)
+
+_CHANGED_KEY = "changed_employees"
+
+SYNC_INTERVAL_SECONDS = int(os.getenv("HR_DIRECTORY_SYNC_SECONDS", 5))
+FULL_RELOAD_SECONDS = 600  # 삭제된 사원은 updated_at 으로 알 수 없으므로 주기적으로 전체 다시 적재
+SYNC_OVERLAP_SECONDS = 60  # 늦게 커밋된 행을 놓치지 않도록 지난 동기화 시각보다 앞에서부터 읽음
+
+
+class EmployeeRecord:
+    __slots__ = FIELDS
+
+    def __init__(self, **values):
+        for f in FIELDS:
+            setattr(self, f, values.get(f))
+
+    @classmethod
+    def from_model(cls, emp: models.Employee) -> "EmployeeRecord":
+        return cls(**{f: getattr(emp, f) for f in FIELDS})
+
+
+class EmployeeDirectory:
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._records: Dict[str, EmployeeRecord] = {}
+        self.version = 0
+        self._synced_at: Optional[datetime] = None  # 마지막 동기화 시작 시각 (DB 시계)
+        self._last_full: Optional[datetime] = None
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def __len__(self):
+        return len(self._records)
+
+    # --- 적재 / 갱신 ---
+
+    def load(self, db: Session):
+        """전체 사원 적재 (서버 시작 시)"""
+        db_now = db.scalar(select(func.now()))
+        rows = db.query(models.Employee).all()
+        records = {e.employee_id: EmployeeRecord.from_model(e) for e in rows}
+        with self._lock:
+            self._records = records
+            self.version += 1
+            self._synced_at = db_now
+            self._last_full = datetime.utcnow()
+        logger.info("사원 디렉터리 %d명 로드 (version %d)", len(records), self.version)
+
+    def refresh(self, db: Session, employee_ids: Iterable[str]):
+        """지정한 사원만 DB 에서 다시 읽음"""
+        ids = set(employee_ids)
+        if not ids:
+            return
+        rows = db.query(models.Employee).filter(models.Employee.employee_id.in_(ids)).all()
+        self.apply({e.employee_id: EmployeeRecord.from_model(e) for e in rows}, deleted=ids - {e.employee_id for e in rows})
+
+    def apply(self, upserts: Dict[str, EmployeeRecord], deleted: Iterable[str] = ()):
+        with self._lock:
+            self._records.update(upserts)
+            for eid in deleted:
+                self._records.pop(eid, None)
+            self.version += 1
+
+    def sync(self, db: Session):
+        """다른 워커에서 바뀐 사원 반영 (updated_at 이 지난 동기화 시각 이후인 행만)"""
+        if self._synced_at is None or (datetime.utcnow() - self._last_full).total_seconds() >= FULL_RELOAD_SECONDS:
+            self.load(db)
+            return
+
+        db_now = db.scalar(select(func.now()))
+        rows = db.query(models.Employee).filter(
+            models.Employee.updated_at >= self._synced_at - timedelta(seconds=SYNC_OVERLAP_SECONDS)
+        ).all()
+        if rows:
+            self.apply({e.employee_id: EmployeeRecord.from_model(e) for e in rows})
+        self._synced_at = db_now
+
+    # --- 주기 동기화 스레드 ---
+
+    def _loop(self):
+        while not self._stop.wait(SYNC_INTERVAL_SECONDS):
+            db = database.SessionLocal()
+            try:
+                self.sync(db)
+            except Exception as e:
+                logger.warning("사원 디렉터리 동기화 실패: %s", e)
+            finally:
+                db.close()
+
+    def start(self):
+        if self._thread is None:
+            self._stop.clear()
+            self._thread = threading.Thread(target=self._loop, name="hr-directory-sync", daemon=True)
+            self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout=SYNC_INTERVAL_SECONDS)
+            self._thread = None
+
+    # --- 조회 ---
+
+    def get(self, employee_id: str) -> Optional[EmployeeRecord]:
+        return self._records.get(employee_id)
+
+    def lookup(self, db: Session, employee_ids: Iterable[str]) -> Dict[str, EmployeeRecord]:
+        """여러 사원을 한 번에 조회 (캐시에 없는 id 만 모아서 DB 조회)"""
+        ids = set(employee_ids)
+        missing = [eid for eid in ids if eid not in self._records]
+        if missing:
+            self.refresh(db, missing)
+        records = self._records
+        return {eid: records[eid] for eid in ids if eid in records}
+
+    def annotate(self, db: Session, rows: list) -> List[Tuple[object, Optional[EmployeeRecord]]]:
+        """행 목록에 사원 정보를 붙여 (행, 사원) 튜플로 리턴 (outerjoin 결과와 같은 모양)"""
+        emp_map = self.lookup(db, {r.employee_id for r in rows})
+        return [(r, emp_map.get(r.employee_id)) for r in rows]
+
+    def search(self, query: str) -> List[str]:
+        """이름 또는 부서에 검색어가 포함된 사원 id 목록"""
+        return [
+            r.employee_id for r in list(self._records.values())
+            if query in (r.name or "") or query in (r.department or "")
+        ]
+
+
+# 앱 전체에서 공유하는 디렉터리
+employee_directory = EmployeeDirectory()
+
+
+# --- 사원 정보 변경 감지 (커밋된 변경만 반영) ---
+
+@event.listens_for(database.SessionLocal, "after_flush")
+def _collect_employee_changes(session: Session, flush_context):
+    changed = session.info.setdefault(_CHANGED_KEY, {"upserts": {}, "deleted": set()})
+    for obj in list(session.new) + list(session.dirty):
+        if isinstance(obj, models.Employee):
+            changed["upserts"][obj.employee_id] = EmployeeRecord.from_model(obj)
+            changed["deleted"].discard(obj.employee_id)
+    for obj in session.deleted:
+        if isinstance(obj, models.Employee):
+            changed["upserts"].pop(obj.employee_id, None)
+            changed["deleted"].add(obj.employee_id)
+
+
+@event.listens_for(database.SessionLocal, "after_commit")
+def _apply_employee_changes(session: Session):
+    changed = session.info.pop(_CHANGED_KEY, None)
+    if changed and (changed["upserts"] or changed["deleted"]):
+        employee_directory.apply(changed["upserts"], changed["deleted"])
+
+
+@event.listens_for(database.SessionLocal, "after_soft_rollback")
+def _drop_employee_changes(session: Session, previous_transaction):
+    session.info.pop(_CHANGED_KEY, None)
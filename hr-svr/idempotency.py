@@ -0,0 +1,200 @@
+from collections import OrderedDict
+from typing import Iterable, Optional
+import base64
+import hashlib
+import json
+import os
+import threading
+import time
+
+# ==========================================
+#  Idempotency-Key 처리 (재시도 중복 요청 방지)
+# ==========================================
+# 모바일 앱이 네트워크 오류로 같은 POST 를 다시 보내면, 처음 응답을 저장해 두었다가
+# DB 를 거치지 않고 그대로 돌려줍니다. 처리 중인 키로 동시에 들어온 요청은 409 로 바로 거절합니다.
+
+DEFAULT_TTL_SECONDS = 60 * 60 * 24
+DEFAULT_MAX_ENTRIES = 10000
+
+# 처리 중 예약이 워커 장애로 남아도 이 시간이 지나면 풀림 (공유 저장소용)
+IN_FLIGHT_TTL_SECONDS = 60
+
+# 처리 중 표시 (응답이 아직 없는 예약 상태)
+IN_FLIGHT = "in_flight"
+
+
+class MemoryIdempotencyStore:
+    """프로세스 내 저장소 (LRU + TTL). 워커 하나일 때 기본값"""
+
+    def __init__(self, max_entries: int = DEFAULT_MAX_ENTRIES, ttl_seconds: int = DEFAULT_TTL_SECONDS):
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self._lock = threading.Lock()
+        self._data: "OrderedDict[str, tuple]" = OrderedDict()  # key -> (만료 시각, 레코드)
+
+    def _get_alive(self, key: str) -> Optional[dict]:
+        item = self._data.get(key)
+        if item is None:
+            return None
+        expires_at, record = item
+        if expires_at < time.monotonic():
+            del self._data[key]
+            return None
+        self._data.move_to_end(key)
+        return record
+
+    def reserve(self, key: str, fingerprint: str) -> Optional[dict]:
+        """키를 처리 중으로 예약. 이미 있으면 기존 레코드를, 새로 예약했으면 None 리턴"""
+        with self._lock:
+            record = self._get_alive(key)
+            if record is not None:
+                return record
+            self._set(key, {"state": IN_FLIGHT, "fingerprint": fingerprint})
+            return None
+
+    def complete(self, key: str, record: dict):
+        with self._lock:
+            self._set(key, record)
+
+    def release(self, key: str):
+        with self._lock:
+            self._data.pop(key, None)
+
+    def _set(self, key: str, record: dict):
+        self._data[key] = (time.monotonic() + self.ttl_seconds, record)
+        self._data.move_to_end(key)
+        while len(self._data) > self.max_entries:
+            self._data.popitem(last=False)
+
+
+class RedisIdempotencyStore:
+    """여러 워커/서버가 공유하는 저장소 (redis 설치 + HR_REDIS_URL 설정 시)"""
+
+    def __init__(self, url: str, ttl_seconds: int = DEFAULT_TTL_SECONDS, prefix: str = "hr:idem:"):
+        import redis  # 선택 의존성
+
+        self.client = redis.Redis.from_url(url)
+        self.ttl_seconds = ttl_seconds
+        self.prefix = prefix
+
+    def reserve(self, key: str, fingerprint: str) -> Optional[dict]:
+        value = json.dumps({"state": IN_FLIGHT, "fingerprint": fingerprint})
+        if self.client.set(self.prefix + key, value, nx=True, ex=IN_FLIGHT_TTL_SECONDS):
+            return None
+        raw = self.client.get(self.prefix + key)
+        # 그 사이 만료되었으면 다시 예약 시도
+        return json.loads(raw) if raw else self.reserve(key, fingerprint)
+
+    def complete(self, key: str, record: dict):
+        self.client.set(self.prefix + key, json.dumps(record), ex=self.ttl_seconds)
+
+    def release(self, key: str):
+        self.client.delete(self.prefix + key)
+
+
+def create_store():
+    """환경변수로 저장소 선택 (HR_IDEMPOTENCY_BACKEND=memory|redis)"""
+    backend = os.getenv("HR_IDEMPOTENCY_BACKEND", "memory")
+    ttl = int(os.getenv("HR_IDEMPOTENCY_TTL", DEFAULT_TTL_SECONDS))
+    if backend == "redis":
+        return RedisIdempotencyStore(os.getenv("HR_REDIS_URL", "redis://127.0.0.1:6379/0"), ttl_seconds=ttl)
+    return MemoryIdempotencyStore(int(os.getenv("HR_IDEMPOTENCY_MAX_ENTRIES", DEFAULT_MAX_ENTRIES)), ttl_seconds=ttl)
+
+
+# --- ASGI 미들웨어 ---
+
+async def _send_json(send, status: int, detail: str, extra_headers: Iterable = ()):
+    body = json.dumps({"detail": detail}, ensure_ascii=False).encode("utf-8")
+    await send({
+        "type": "http.response.start",
+        "status": status,
+        "headers": [
+            (b"content-type", b"application/json"),
+            (b"content-length", str(len(body)).encode()),
+            *extra_headers,
+        ],
+    })
+    await send({"type": "http.response.body", "body": body})
+
+
+class IdempotencyMiddleware:
+    """지정한 POST 경로에서 Idempotency-Key 헤더가 있으면 응답을 저장/재생"""
+
+    def __init__(self, app, paths: Iterable[str], store=None):
+        self.app = app
+        self.paths = set(paths)
+        self.store = store or create_store()
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or scope["method"] != "POST" or scope["path"] not in self.paths:
+            return await self.app(scope, receive, send)
+
+        headers = dict(scope["headers"])
+        idem_key = headers.get(b"idempotency-key")
+        if not idem_key:
+            return await self.app(scope, receive, send)
+
+        # 본문을 미리 읽어 지문을 만들고, 앱에는 같은 본문을 다시 흘려줌
+        body = b""
+        more_body = True
+        while more_body:
+            message = await receive()
+            body += message.get("body", b"")
+            more_body = message.get("more_body", False)
+
+        fingerprint = hashlib.sha256(body).hexdigest()
+        key = f"{scope['path']}:{idem_key.decode('latin-1')}"
+
+        record = self.store.reserve(key, fingerprint)
+        if record is not None:
+            if record.get("fingerprint") != fingerprint:
+                return await _send_json(send, 422, "같은 Idempotency-Key 로 다른 요청이 들어왔습니다.")
+            if record.get("state") == IN_FLIGHT:
+                return await _send_json(send, 409, "같은 요청을 처리 중입니다. 잠시 후 다시 시도하세요.", [(b"retry-after", b"1")])
+            # 처음 응답 그대로 재생 (DB 접근 없음)
+            await send({
+                "type": "http.response.start",
+                "status": record["status"],
+                "headers": [(k.encode("latin-1"), v.encode("latin-1")) for k, v in record["headers"]]
+                           + [(b"idempotent-replayed", b"true")],
+            })
+            await send({"type": "http.response.body", "body": base64.b64decode(record["body"])})
+            return
+
+        body_sent = False
+
+        async def replay_receive():
+            nonlocal body_sent
+            if not body_sent:
+                body_sent = True
+                return {"type": "http.request", "body": body, "more_body": False}
+            return await receive()
+
+        response = {"status": 500, "headers": [], "body": b""}
+
+        async def capture_send(message):
+            if message["type"] == "http.response.start":
+                response["status"] = message["status"]
+                response["headers"] = message.get("headers", [])
+            elif message["type"] == "http.response.body":
+                response["body"] += message.get("body", b"")
+            await send(message)
+
+        try:
+            await self.app(scope, replay_receive, capture_send)
+        except Exception:
+            self.store.release(key)
+            raise
+
+        # 서버 오류는 재시도할 수 있도록 저장하지 않음
+        if response["status"] >= 500:
+            self.store.release(key)
+            return
+
+        self.store.complete(key, {
+            "state": "done",
+            "fingerprint": fingerprint,
+            "status": response["status"],
+            "headers": [(k.decode("latin-1"), v.decode("latin-1")) for k, v in response["headers"]],
+            "body": base64.b64encode(response["body"]).decode("ascii"),
+        })
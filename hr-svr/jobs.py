@@ -0,0 +1,249 @@
+from collections import deque
+from typing import Callable, Deque, List, Optional
+import atexit
+import logging
+import os
+import queue
+import threading
+import time
+
+from sqlalchemy import event
+from sqlalchemy.orm import Session
+
+import database
+
+logger = logging.getLogger(__name__)
+
+# ==========================================
+#  백그라운드 작업 큐 (커밋 이후 처리)
+# ==========================================
+# 응답을 막을 필요가 없는 작업(알림, 캐시 갱신, 집계 등)은 enqueue_after_commit 으로 등록합니다.
+# 트랜잭션이 커밋된 경우에만 큐에 들어가고, 롤백되면 버려집니다.
+# 작업 함수는 요청 세션을 쓰면 안 되며, 필요하면 database.SessionLocal() 로 새 세션을 엽니다.
+# 커밋 훅 안에서는 절대 작업을 실행하지 않습니다. (SQLite 쓰기 잠금을 아직 들고 있어 작업이 쓰면 멈춤)
+# 워커가 없으면(스크립트/종료 중) 큐에 쌓아 두었다가 shutdown() / drain() / 프로세스 종료 시점에 처리합니다.
+
+MAX_QUEUE_SIZE = int(os.getenv("HR_JOB_QUEUE_SIZE", 1000))
+WORKER_COUNT = int(os.getenv("HR_JOB_WORKERS", 2))
+MAX_RETRIES = 3
+BACKOFF_SECONDS = 0.5
+
+_PENDING_KEY = "pending_jobs"
+
+
+class Job:
+    __slots__ = ("func", "args", "kwargs", "attempt", "enqueued_at")
+
+    def __init__(self, func: Callable, args: tuple, kwargs: dict):
+        self.func = func
+        self.args = args
+        self.kwargs = kwargs
+        self.attempt = 0
+        self.enqueued_at = time.monotonic()
+
+    @property
+    def name(self) -> str:
+        return getattr(self.func, "__name__", repr(self.func))
+
+
+class JobQueue:
+    def __init__(self, max_size: int = MAX_QUEUE_SIZE, workers: int = WORKER_COUNT):
+        self._queue: "queue.Queue[Optional[Job]]" = queue.Queue(maxsize=max_size)
+        self._worker_count = workers
+        self._workers: List[threading.Thread] = []
+        self._accepting = False
+        self._lock = threading.Lock()
+        self._timers: List[threading.Timer] = []
+        self._overflow: Deque[Job] = deque()  # 큐가 가득 찼을 때 잠시 받아 두는 곳 (워커가 빈 자리에 옮김)
+        self.stats = {
+            "enqueued": 0, "completed": 0, "failed": 0, "retried": 0, "ran_inline": 0, "overflowed": 0,
+            "wait_ms_total": 0.0, "run_ms_total": 0.0, "wait_ms_max": 0.0,
+        }
+
+    # --- 시작 / 종료 ---
+
+    def start(self):
+        if self._workers:
+            return
+        self._accepting = True
+        for i in range(self._worker_count):
+            t = threading.Thread(target=self._work, name=f"hr-job-{i}", daemon=True)
+            t.start()
+            self._workers.append(t)
+        logger.info("백그라운드 작업 워커 %d개 시작", self._worker_count)
+
+    def shutdown(self, timeout: float = 10.0):
+        """새 작업을 막고, 남은 작업을 처리한 뒤 워커 종료"""
+        self._accepting = False
+        with self._lock:
+            timers, self._timers = self._timers, []
+        for timer in timers:
+            timer.cancel()
+            self._enqueue(timer.args[0])  # 재시도 대기 중이던 작업도 마저 처리
+
+        deadline = time.monotonic() + timeout
+        for _ in self._workers:
+            self._queue.put(None)
+        for t in self._workers:
+            t.join(max(0.0, deadline - time.monotonic()))
+        alive = any(t.is_alive() for t in self._workers)
+        self._workers = []
+
+        if alive:
+            logger.warning("종료 시간 초과로 작업 %d건을 처리하지 못했습니다.", self._queue.qsize() + len(self._overflow))
+            return
+        self.drain()  # 워커가 끝난 뒤 남은 작업 (넘친 작업, 종료 중에 들어온 작업)
+
+    def drain(self):
+        """남은 작업을 호출한 스레드에서 처리 (종료 시/스크립트용. 커밋 훅 안에서 부르면 안 됨)"""
+        while True:
+            try:
+                job = self._queue.get_nowait()
+                self._queue.task_done()
+            except queue.Empty:
+                with self._lock:
+                    if not self._overflow:
+                        return
+                    job = self._overflow.popleft()
+            if job is not None:
+                self._run_now(job)
+
+    # --- 등록 ---
+
+    def submit(self, func: Callable, *args, **kwargs):
+        self._put(Job(func, args, kwargs))
+
+    def _put(self, job: Job):
+        """큐에 넣기만 하고 호출한 스레드에서는 실행하지 않음 (커밋 훅에서 불림)"""
+        with self._lock:
+            self.stats["enqueued"] += 1
+        self._enqueue(job)
+
+    def _enqueue(self, job: Job):
+        with self._lock:
+            if self._overflow:
+                self._overflow.append(job)  # 순서 유지: 먼저 넘친 작업보다 앞서지 않음
+                self.stats["overflowed"] += 1
+                return
+        try:
+            self._queue.put_nowait(job)
+        except queue.Full:
+            # 큐가 가득 차도 버리지 않음. 훅 안에서 실행하면 쓰기 잠금을 기다리며 멈추므로 따로 쌓아 둠
+            logger.warning("작업 큐가 가득 차서 %s 을(를) 대기열 밖에 보관합니다.", job.name)
+            with self._lock:
+                self._overflow.append(job)
+                self.stats["overflowed"] += 1
+
+    def _refill(self):
+        """넘친 작업을 큐의 빈 자리로 옮김"""
+        with self._lock:
+            while self._overflow:
+                try:
+                    self._queue.put_nowait(self._overflow[0])
+                except queue.Full:
+                    return
+                self._overflow.popleft()
+
+    def _run_now(self, job: Job):
+        with self._lock:
+            self.stats["ran_inline"] += 1
+        self._run(job, retry=False)
+
+    # --- 실행 ---
+
+    def _work(self):
+        while True:
+            job = self._queue.get()
+            try:
+                if job is None:
+                    return
+                self._run(job, retry=True)
+            finally:
+                self._queue.task_done()
+                self._refill()
+
+    def _run(self, job: Job, retry: bool):
+        started = time.monotonic()
+        wait_ms = (started - job.enqueued_at) * 1000
+        try:
+            job.func(*job.args, **job.kwargs)
+        except Exception:
+            job.attempt += 1
+            if retry and job.attempt <= MAX_RETRIES and self._accepting:
+                delay = BACKOFF_SECONDS * (2 ** (job.attempt - 1))
+                logger.warning("작업 %s 실패, %.1f초 후 재시도 (%d/%d)", job.name, delay, job.attempt, MAX_RETRIES)
+                self._schedule_retry(job, delay)
+                with self._lock:
+                    self.stats["retried"] += 1
+                return
+            logger.exception("작업 %s 최종 실패", job.name)
+            with self._lock:
+                self.stats["failed"] += 1
+            return
+
+        run_ms = (time.monotonic() - started) * 1000
+        with self._lock:
+            self.stats["completed"] += 1
+            self.stats["wait_ms_total"] += wait_ms
+            self.stats["run_ms_total"] += run_ms
+            self.stats["wait_ms_max"] = max(self.stats["wait_ms_max"], wait_ms)
+
+    def _schedule_retry(self, job: Job, delay: float):
+        def requeue(j: Job):
+            with self._lock:
+                if timer in self._timers:
+                    self._timers.remove(timer)
+            j.enqueued_at = time.monotonic()
+            self._enqueue(j)
+
+        timer = threading.Timer(delay, requeue, args=(job,))
+        timer.daemon = True
+        with self._lock:
+            self._timers.append(timer)
+        timer.start()
+
+    # --- 지표 ---
+
+    def metrics(self) -> dict:
+        with self._lock:
+            s = dict(self.stats)
+        done = s["completed"] or 1
+        return {
+            "queue_depth": self._queue.qsize(),
+            "queue_capacity": self._queue.maxsize,
+            "overflow_depth": len(self._overflow),
+            "workers": len(self._workers),
+            "enqueued": s["enqueued"],
+            "completed": s["completed"],
+            "failed": s["failed"],
+            "retried": s["retried"],
+            "ran_inline": s["ran_inline"],
+            "overflowed": s["overflowed"],
+            "avg_wait_ms": round(s["wait_ms_total"] / done, 2),
+            "max_wait_ms": round(s["wait_ms_max"], 2),
+            "avg_run_ms": round(s["run_ms_total"] / done, 2),
+        }
+
+
+# 앱 전체에서 공유하는 작업 큐
+job_queue = JobQueue()
+atexit.register(job_queue.drain)  # 워커 없이 커밋한 스크립트의 작업도 종료 전에 처리
+
+
+def enqueue_after_commit(db: Session, func: Callable, *args, **kwargs):
+    """현재 트랜잭션이 커밋되면 실행할 작업 등록 (롤백되면 버려짐)"""
+    db.info.setdefault(_PENDING_KEY, []).append(Job(func, args, kwargs))
+
+
+@event.listens_for(database.SessionLocal, "after_commit")
+def _flush_pending_jobs(session: Session):
+    for job in session.info.pop(_PENDING_KEY, []):
+        job.enqueued_at = time.monotonic()
+        job_queue._put(job)
+
+
+@event.listens_for(database.SessionLocal, "after_soft_rollback")
+def _drop_pending_jobs(session: Session, previous_transaction):
+    dropped = session.info.pop(_PENDING_KEY, [])
+    if dropped:
+        logger.info("롤백으로 작업 %d건 취소", len(dropped))
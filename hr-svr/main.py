@@ -1,26 +1,49 @@
-from fastapi import FastAPI, HTTPException, Depends
+from fastapi import FastAPI, HTTPException, Depends, Header
+from fastapi.responses import JSONResponse
+from contextlib import asynccontextmanager
 from fastapi.middleware.cors import CORSMiddleware
 from sqlalchemy.orm import Session
+from sqlalchemy.exc import IntegrityError
 from typing import List, Optional
 from datetime import date, datetime, timedelta
 import calendar
 import logging
+import uuid
 from pydantic import BaseModel
 
 # --- 파일 임포트 (프로젝트 구조에 맞게 확인) ---
-import database
 import models
 import schemas
-from routers import leaves, auth
+import archive
+import bootstrap
+from routers import leaves, auth, holidays, payroll, analytics
+from routers import audit as audit_router
 from database import get_db
+from workdays import work_calendar
+from month_close import calc_work_seconds
+from idempotency import IdempotencyMiddleware
+from admission import AdmissionMiddleware, admission_controller
+from jobs import job_queue
+from directory import employee_directory
+from audit import audit_writer
 
 # --- 설정 ---
 logging.basicConfig(level=logging.INFO)
 
-# DB 테이블 자동 생성
-models.Base.metadata.create_all(bind=database.engine)
-
-app = FastAPI()
+# 서버 기동/종료 (import 시점에는 DB 에 접속하지 않음)
+# 스키마 확인, 커넥션 풀 예열, 휴일/사원 디렉터리/토큰 폐기 목록 적재는 백그라운드에서 진행하고
+# 끝나면 /api/health/ready 가 200 을 돌려줌
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    job_queue.start()
+    audit_writer.start()
+    bootstrap.start()
+    yield
+    bootstrap.stop()
+    job_queue.shutdown()
+    audit_writer.stop()  # 남은 감사 로그 기록 (DB 가 안 되면 스풀 파일로)
+
+app = FastAPI(lifespan=lifespan)
 
 # ==========================================
 # CORS 설정
@@ -32,6 +55,15 @@ origins = [
     "http://127.0.0.1:8000",
 ]
 
+# 재시도된 POST 는 처음 응답을 재생 (CORS 보다 안쪽에 두어야 재생 응답에도 CORS 헤더가 붙음)
+app.add_middleware(
+    IdempotencyMiddleware,
+    paths=["/api/applications", "/api/attendance/clock-in"],
+)
+
+# 등급별 동시 처리 제한 + 사원/IP 속도 제한 (출퇴근 > 일반 화면 > 관리자 조회 순으로 우선 처리)
+app.add_middleware(AdmissionMiddleware)
+
 app.add_middleware(
     CORSMiddleware,
     allow_origins=["*"],
@@ -43,6 +75,26 @@ app.add_middleware(
 # --- 라우터 등록 ---
 app.include_router(leaves.router, prefix="/api/leaves", tags=["leaves"])
 app.include_router(auth.router, prefix="/api/auth", tags=["auth"])
+app.include_router(holidays.router, prefix="/api/holidays", tags=["holidays"])
+app.include_router(payroll.router, prefix="/api/payroll", tags=["payroll"])
+app.include_router(analytics.router, prefix="/api/analytics", tags=["analytics"])
+app.include_router(audit_router.router, prefix="/api/audit", tags=["audit"])
+
+
+# --- 상태 확인 (로드밸런서/오케스트레이터용) ---
+@app.get("/api/health/live")
+def liveness():
+    return {"status": "alive"}
+
+@app.get("/api/health/ready")
+def readiness():
+    state = bootstrap.readiness.to_dict()
+    return JSONResponse(status_code=200 if bootstrap.readiness.ready else 503, content=state)
+
+# 수용 제어 지표 (등급별 처리/대기/거절 수)
+@app.get("/api/admission/metrics")
+def get_admission_metrics():
+    return admission_controller.metrics()
 
 
 # ==========================================
@@ -109,6 +161,10 @@ class DashboardSummary(BaseModel):
 #  API 구현
 # ==========================================
 
+def new_record_id(prefix: str) -> str:
+    """같은 초에 여러 사원이 요청해도 겹치지 않는 기록 ID (시각 + 랜덤)"""
+    return f"{prefix}-{int(datetime.now().timestamp())}-{uuid.uuid4().hex[:12]}"
+
 # 1. 출근
 @app.post("/api/attendance/clock-in")
 def clock_in(request: AttendanceRequest, db: Session = Depends(get_db)):
@@ -122,7 +178,7 @@ def clock_in(request: AttendanceRequest, db: Session = Depends(get_db)):
         raise HTTPException(status_code=400, detail="이미 오늘 출근 처리가 완료되었습니다.")
     
     new_attendance = models.Attendance(
-        attendance_id=f"ATT-{int(datetime.now().timestamp())}", 
+        attendance_id=new_record_id("ATT"), 
         employee_id=request.employee_id, 
         attendance_date=today, 
         attendance_in_time=datetime.now().time(), 
@@ -130,7 +186,18 @@ def clock_in(request: AttendanceRequest, db: Session = Depends(get_db)):
         attendance_in_location=request.location
     )
     db.add(new_attendance)
-    db.commit()
+    try:
+        db.commit()
+    except IntegrityError:
+        db.rollback()
+        # 동시에 들어온 중복 출근 요청 (uq_attendance_employee_date) 인지 다시 조회해서 확인
+        duplicate = db.query(models.Attendance.attendance_id).filter(
+            models.Attendance.employee_id == request.employee_id,
+            models.Attendance.attendance_date == today
+        ).first()
+        if duplicate:
+            raise HTTPException(status_code=400, detail="이미 오늘 출근 처리가 완료되었습니다.")
+        raise
     return {"message": "출근 처리되었습니다."}
 
 # 2. 퇴근
@@ -193,7 +260,11 @@ def get_weekly_status(employee_id: str, db: Session = Depends(get_db)):
 
 # 4. 신청서 작성
 @app.post("/api/applications")
-def create_application(req: ApplicationRequest, db: Session = Depends(get_db)):
+def create_application(
+    req: ApplicationRequest,
+    idempotency_key: Optional[str] = Header(None, alias="Idempotency-Key"),
+    db: Session = Depends(get_db)
+):
     try:
         def parse_dt(d_str):
             for fmt in ("%Y-%m-%d %H:%M", "%Y-%m-%d", "%Y-%m-%d %H:%M:%S"):
@@ -204,18 +275,28 @@ def create_application(req: ApplicationRequest, db: Session = Depends(get_db)):
             return datetime.strptime(d_str, "%Y-%m-%d")
 
         new_app = models.ApplicationModel(
-            application_id=f"APP-{int(datetime.now().timestamp())}",
+            application_id=new_record_id("APP"),
             employee_id=req.employee_id,
             application_type=req.application_type,
             start_date=parse_dt(req.start_date),
             end_date=parse_dt(req.end_date),
             reason=req.reason,
             status="대기",
-            created_at=datetime.now()
+            created_at=datetime.now(),
+            idempotency_key=idempotency_key
         )
         db.add(new_app)
         db.commit()
         return {"message": "신청이 완료되었습니다."}
+    except IntegrityError as e:
+        db.rollback()
+        # 같은 Idempotency-Key 로 다른 워커에서 이미 저장된 경우만 중복으로 응답
+        if idempotency_key and db.query(models.ApplicationModel.application_id).filter(
+            models.ApplicationModel.idempotency_key == idempotency_key
+        ).first():
+            raise HTTPException(status_code=409, detail="이미 접수된 신청입니다.")
+        print(f"Error occurred: {e}")
+        raise HTTPException(status_code=500, detail="신청 중 오류가 발생했습니다.")
     except Exception as e:
         print(f"Error occurred: {e}")
         raise HTTPException(status_code=500, detail="신청 중 오류가 발생했습니다.")
@@ -234,9 +315,7 @@ def get_application_list(
     query: Optional[str] = None, 
     db: Session = Depends(get_db)
 ):
-    q = db.query(models.ApplicationModel, models.Employee).outerjoin(
-        models.Employee, models.ApplicationModel.employee_id == models.Employee.employee_id
-    )
+    q = db.query(models.ApplicationModel)
 
     if start and end:
         s_date = datetime.strptime(start, "%Y-%m-%d")
@@ -244,12 +323,20 @@ def get_application_list(
         q = q.filter(models.ApplicationModel.start_date.between(s_date, e_date))
 
     if query:
-        q = q.filter(
-            (models.Employee.name.like(f"%{query}%")) | 
-            (models.Employee.department.like(f"%{query}%"))
-        )
+        # 이름/부서 검색은 사원 디렉터리에서 id 로 바꿔서 필터링
+        matched_ids = set(employee_directory.search(query))
+        q = q.filter(models.ApplicationModel.employee_id.in_(matched_ids))
+
+    apps = q.order_by(models.ApplicationModel.created_at.desc()).all()
 
-    records = q.order_by(models.ApplicationModel.created_at.desc()).all()
+    if start and end:
+        archived = archive.read_applications(s_date, e_date)
+        if query:
+            archived = [a for a in archived if a.employee_id in matched_ids]
+        apps += archived
+        apps.sort(key=lambda a: a.created_at or datetime.min, reverse=True)
+
+    records = employee_directory.annotate(db, apps)
 
     result = []
     days_kr = ["월", "화", "수", "목", "금", "토", "일"]
@@ -257,10 +344,14 @@ def get_application_list(
     for app, emp in records:
         duration = "-"
         if app.start_date and app.end_date:
-            diff = (app.end_date - app.start_date).total_seconds()
-            h = int(diff // 3600)
-            m = int((diff % 3600) // 60)
-            duration = f"{h:02d}:{m:02d}"
+            if app.start_date.date() != app.end_date.date():
+                # 여러 날에 걸친 신청은 근무일 수로 표시
+                duration = f"{work_calendar.count_workdays(app.start_date, app.end_date)}일"
+            else:
+                diff = (app.end_date - app.start_date).total_seconds()
+                h = int(diff // 3600)
+                m = int((diff % 3600) // 60)
+                duration = f"{h:02d}:{m:02d}"
 
         category = "기타"
         if "휴가" in app.application_type or "연차" in app.application_type: category = "휴가"
@@ -290,11 +381,13 @@ def get_application_list(
 
 # 7. [관리자용] 신청 내역 상태 변경
 @app.put("/api/applications/{app_id}/status")
-def update_application_status(app_id: str, req: ApplicationStatusUpdate, db: Session = Depends(get_db)):
+def update_application_status(
+    app_id: str,
+    req: ApplicationStatusUpdate,
+    db: Session = Depends(get_db),
+    actor_id: Optional[str] = Depends(auth.get_audit_actor),
+):
     app = db.query(models.ApplicationModel).filter(models.ApplicationModel.application_id == app_id).first()
-    
-    if not app and app_id.isdigit():
-        app = db.query(models.ApplicationModel).filter(models.ApplicationModel.id == int(app_id)).first()
         
     if not app:
         raise HTTPException(status_code=404, detail="해당 신청 내역을 찾을 수 없습니다.")
@@ -315,11 +408,15 @@ def get_recent_applications(employee_id: str, db: Session = Depends(get_db)):
     
     result = []
     for r in records:
+        duration = "-"
+        if any(k in r.application_type for k in ["휴가", "연차", "반차", "병가"]):
+            duration = f"{work_calendar.leave_days(r.start_date, r.end_date, r.application_type):g}"
+
         result.append({
             "type": r.application_type,
             "startDate": r.start_date.strftime("%Y.%m.%d"),
             "endDate": r.end_date.strftime("%Y.%m.%d"),
-            "duration": "-", 
+            "duration": duration, 
             "requestDate": r.created_at.strftime("%Y.%m.%d"),
             "status": r.status
         })
@@ -328,7 +425,7 @@ def get_recent_applications(employee_id: str, db: Session = Depends(get_db)):
 # 9. 월별 근태 조회 (개인)
 @app.get("/api/attendance/monthly/{employee_id}", response_model=MonthlyResponse)
 def get_monthly_attendance(employee_id: str, year: int, month: int, db: Session = Depends(get_db)):
-    emp = db.query(models.Employee).filter(models.Employee.employee_id == employee_id).first()
+    emp = employee_directory.lookup(db, [employee_id]).get(employee_id)
     user_name = emp.name if emp else "알 수 없음"
     
     _, last_day = calendar.monthrange(year, month)
@@ -339,11 +436,21 @@ def get_monthly_attendance(employee_id: str, year: int, month: int, db: Session
         models.Attendance.employee_id == employee_id,
         models.Attendance.attendance_date.between(start_date, end_date)
     ).order_by(models.Attendance.attendance_date.asc()).all()
+    # 지난 연도는 아카이브(Parquet)에서 읽어 합침
+    records += archive.read_attendance(start_date, end_date, employee_id)
     
     records_map = {r.attendance_date: r for r in records}
     
     processed = []
     stats = {"total": last_day, "normal": 0, "unprocessed": 0, "actual": len(records)}
+
+    # 결근 = 어제까지의 근무일 수 - 그 중 출근 기록이 있는 근무일 수 (달력 누적합으로 O(1) 계산)
+    absence_end = min(end_date, date.today() - timedelta(days=1))
+    attended_workdays = sum(
+        1 for d in records_map
+        if d <= absence_end and work_calendar.is_workday(d)
+    )
+    stats["unprocessed"] += work_calendar.count_workdays(start_date, absence_end) - attended_workdays
     day_map = {0: "월", 1: "화", 2: "수", 3: "목", 4: "금", 5: "토", 6: "일"}
 
     def simple_loc(loc):
@@ -384,10 +491,8 @@ def get_monthly_attendance(employee_id: str, year: int, month: int, db: Session
                 item["status"] = "퇴근미처리"
                 stats["unprocessed"] += 1
         else:
-            if curr.weekday() >= 5: item["status"] = "-"
-            elif curr < date.today():
-                item["status"] = "결근"
-                stats["unprocessed"] += 1
+            if not work_calendar.is_workday(curr): item["status"] = "-"
+            elif curr < date.today(): item["status"] = "결근"
             else: item["status"] = "-"
 
         processed.append(item)
@@ -413,31 +518,21 @@ def get_dashboard_summary(employee_id: str, db: Session = Depends(get_db)):
     total_work = 0
     total_over = 0
     for r in monthly_records:
-        if r.attendance_in_time and r.attendance_out_time:
-            t_in = datetime.combine(r.attendance_date, r.attendance_in_time)
-            t_out = datetime.combine(r.attendance_date, r.attendance_out_time)
-            total_work += (t_out - t_in).total_seconds()
-            std_close = t_in.replace(hour=18, minute=0, second=0)
-            if t_out > std_close: 
-                total_over += (t_out - max(t_in, std_close)).total_seconds()
+        work, over = calc_work_seconds(r)
+        total_work += work
+        total_over += over
             
-    emp = db.query(models.Employee).filter(models.Employee.employee_id == employee_id).first()
+    emp = employee_directory.lookup(db, [employee_id]).get(employee_id)
     
     total_leave = float(emp.total_leave_days) if emp and emp.total_leave_days else 15.0
     
-    approved_apps = db.query(models.ApplicationModel).filter(
-        models.ApplicationModel.employee_id == employee_id,
-        models.ApplicationModel.status == "승인"
-    ).all()
+    # 아카이브로 옮겨진 지난 연도 승인 건도 포함
+    approved_apps = archive.employee_applications(db, employee_id, status="승인")
     
     used_leave = 0.0
     for app in approved_apps:
-        if app.application_type in ["연차", "병가", "경조사 휴가"]:
-             if app.application_type == "연차":
-                days = (app.end_date - app.start_date).days + 1
-                used_leave += float(days)
-        elif app.application_type in ["오전 반차", "오후 반차"]:
-            used_leave += 0.5
+        if app.application_type in ["연차", "오전 반차", "오후 반차"]:
+            used_leave += work_calendar.leave_days(app.start_date, app.end_date, app.application_type)
 
     outing_count = db.query(models.ApplicationModel).filter(
         models.ApplicationModel.employee_id == employee_id, 
@@ -461,11 +556,11 @@ def get_dashboard_summary(employee_id: str, db: Session = Depends(get_db)):
 def get_all_attendance(date: Optional[str] = None, db: Session = Depends(get_db)):
     target_date = datetime.strptime(date, "%Y-%m-%d").date() if date else datetime.now().date()
     
-    records = db.query(models.Attendance, models.Employee).outerjoin(
-        models.Employee, models.Attendance.employee_id == models.Employee.employee_id
-    ).filter(
+    rows = db.query(models.Attendance).filter(
         models.Attendance.attendance_date == target_date
     ).all()
+    rows += archive.read_attendance(target_date, target_date)
+    records = employee_directory.annotate(db, rows)
     
     result = []
     for att, emp in records:
@@ -518,9 +613,7 @@ def get_leave_schedule(
         target_start = datetime(today.year, today.month, 1)
         target_end = datetime(today.year, today.month, last_day, 23, 59, 59)
 
-    apps = db.query(models.ApplicationModel, models.Employee).outerjoin(
-        models.Employee, models.ApplicationModel.employee_id == models.Employee.employee_id
-    ).filter(
+    apps = db.query(models.ApplicationModel).filter(
         models.ApplicationModel.start_date <= target_end,
         models.ApplicationModel.end_date >= target_start,
         (models.ApplicationModel.application_type.like("%휴가%")) | 
@@ -529,6 +622,15 @@ def get_leave_schedule(
         (models.ApplicationModel.application_type.like("%병가%"))
     ).all()
 
+    # 지난 연도 신청서는 아카이브에서 읽음 (start_date 기준 파티션이므로 시작일이 조회 종료일 이전인 연도를 훑음)
+    leave_keywords = ["휴가", "연차", "반차", "병가"]
+    archived = archive.read_applications(datetime(target_start.year - 1, 1, 1), target_end)
+    apps += [
+        a for a in archived
+        if a.end_date >= target_start and any(k in a.application_type for k in leave_keywords)
+    ]
+    apps = employee_directory.annotate(db, apps)
+
     result = []
     days_kr = ["월", "화", "수", "목", "금", "토", "일"]
 
@@ -573,7 +675,7 @@ def get_leave_schedule(
 # 14. [추가] 직원 상세 정보 조회 (프론트엔드 에러 해결용)
 @app.get("/api/employees/{employee_id}")
 def get_employee_detail(employee_id: str, db: Session = Depends(get_db)):
-    emp = db.query(models.Employee).filter(models.Employee.employee_id == employee_id).first()
+    emp = employee_directory.lookup(db, [employee_id]).get(employee_id)
     
     if not emp:
         # 직원이 없으면 에러 대신 기본 정보라도 리턴 (프론트엔드 멈춤 방지)
@@ -594,7 +696,12 @@ def get_employee_detail(employee_id: str, db: Session = Depends(get_db)):
         "department": emp.department,
         "position": emp.position,
         "email": emp.email,
-        "phone": emp.phone,
-        "join_date": str(emp.join_date) if emp.join_date else "-",
+        "phone": emp.phone_number or "-",
+        "join_date": str(emp.hire_date) if emp.hire_date else "-",
         "total_leave_days": emp.total_leave_days
-    }
\ No newline at end of file
+    }
+
+# 15. [운영] 백그라운드 작업 큐 지표 (큐 깊이, 대기/처리 시간)
+@app.get("/api/jobs/metrics")
+def get_job_metrics():
+    return job_queue.metrics()
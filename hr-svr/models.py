@@ -1,4 +1,4 @@
-from sqlalchemy import Column, String, Integer, Date, Time, DateTime, Text, TIMESTAMP, Float
+from sqlalchemy import Column, String, Integer, Date, Time, DateTime, Text, TIMESTAMP, Float, Index, UniqueConstraint, func
 from database import Base
 
 # 1. 사원 정보 테이블
@@ -25,10 +25,20 @@ class Employee(Base):
     # 연차 개수 (반차 계산을 위해 소수점 허용)
     total_leave_days = Column(Float, default=15.0)
 
+    # 마지막 변경 시각 (DB 시계 기준). 다른 워커의 사원 디렉터리가 바뀐 행만 가져갈 때 사용
+    # SQL 로 직접 바꿔도 갱신되도록 DB 쪽에도 트리거/ON UPDATE 를 걸어 둠 (bootstrap 마이그레이션 5)
+    updated_at = Column(DateTime, server_default=func.now(), onupdate=func.now(), index=True)
+
 
 # 2. 출퇴근 기록 테이블
 class Attendance(Base):
     __tablename__ = 'attendance'
+    # 연도별 파티션 키(attendance_date) 기준 범위 조회용 인덱스
+    __table_args__ = (
+        Index('ix_attendance_date_employee', 'attendance_date', 'employee_id'),
+        # 하루 한 번만 출근 (동시에 들어온 중복 출근 요청은 DB 에서 거절)
+        UniqueConstraint('employee_id', 'attendance_date', name='uq_attendance_employee_date'),
+    )
 
     # 출퇴근 기록 ID
     attendance_id = Column(String(50), primary_key=True)
@@ -54,6 +64,10 @@ class Attendance(Base):
 # 3. 신청서 테이블 (휴가/외출 등)
 class ApplicationModel(Base):
     __tablename__ = 'applications'
+    # 연도별 파티션 키(start_date) 기준 범위 조회용 인덱스
+    __table_args__ = (
+        Index('ix_applications_start_employee', 'start_date', 'employee_id'),
+    )
 
     # 신청서 ID
     application_id = Column(String(50), primary_key=True)
@@ -75,4 +89,104 @@ class ApplicationModel(Base):
     status = Column(String(50), default="대기")
     
     # 작성 시간
-    created_at = Column(TIMESTAMP)
\ No newline at end of file
+    created_at = Column(TIMESTAMP)
+
+    # 클라이언트 재시도 중복 방지 키 (Idempotency-Key 헤더)
+    idempotency_key = Column(String(100), unique=True, nullable=True)
+
+
+# 4. 회사 휴일 테이블 (음력 공휴일, 대체공휴일, 창립기념일 등)
+class CompanyHoliday(Base):
+    __tablename__ = 'company_holidays'
+
+    # 휴일 날짜
+    holiday_date = Column(Date, primary_key=True)
+
+    # 휴일 이름
+    name = Column(String(100), nullable=False)
+
+
+# 5. 월 마감 급여 스냅샷 (마감 후에는 수정하지 않음)
+class PayrollSnapshot(Base):
+    __tablename__ = 'payroll_snapshots'
+
+    # 마감 월 (YYYY-MM)
+    period = Column(String(7), primary_key=True)
+
+    # 사원 ID
+    employee_id = Column(String(50), primary_key=True)
+
+    # 근무/연장 시간 (분)
+    work_minutes = Column(Integer, nullable=False, default=0)
+    overtime_minutes = Column(Integer, nullable=False, default=0)
+
+    # 결근 일수 / 휴가 사용 일수
+    absence_days = Column(Integer, nullable=False, default=0)
+    leave_days = Column(Float, nullable=False, default=0.0)
+
+    # 마감 배치의 샤드 번호와 행 체크섬 (sha256)
+    shard_no = Column(Integer, nullable=False)
+    checksum = Column(String(64), nullable=False)
+
+    # 마감 시각
+    closed_at = Column(DateTime, nullable=False)
+
+
+# 6. 월 마감 샤드 진행 상태 (재시작 시 완료된 샤드는 건너뜀)
+class MonthCloseShard(Base):
+    __tablename__ = 'month_close_shards'
+
+    period = Column(String(7), primary_key=True)
+    shard_no = Column(Integer, primary_key=True)
+    shard_count = Column(Integer, nullable=False)
+
+    # 처리 사원 수 / 샤드 체크섬 (행 체크섬들을 이어 붙인 sha256)
+    employee_count = Column(Integer, nullable=False, default=0)
+    checksum = Column(String(64), nullable=False)
+
+    finished_at = Column(DateTime, nullable=False)
+
+
+# 7. 토큰 폐기 기록 (로그아웃, 리프레시 토큰 교체, 퇴사 처리)
+class TokenRevocation(Base):
+    __tablename__ = 'token_revocations'
+
+    id = Column(Integer, primary_key=True, autoincrement=True)
+
+    # 폐기된 토큰 id (비어 있으면 revoked_at 이전에 발급된 해당 사원의 모든 토큰 폐기)
+    # 유니크: 같은 리프레시 토큰을 두 번 쓰면 두 번째 INSERT 가 실패 -> 재사용으로 판단
+    jti = Column(String(64), nullable=True, index=True, unique=True)
+
+    # 사원 ID
+    employee_id = Column(String(50), nullable=False, index=True)
+
+    # 폐기 시각 / 이 기록이 필요 없어지는 시각 (토큰 만료 시각, UTC)
+    revoked_at = Column(DateTime, nullable=False, index=True)
+    expires_at = Column(DateTime, nullable=False, index=True)
+
+
+# 8. 스키마 버전 기록 (bootstrap.SCHEMA_VERSION 과 같으면 기동 시 테이블 확인을 건너뜀)
+class SchemaVersion(Base):
+    __tablename__ = 'schema_version'
+
+    version = Column(Integer, primary_key=True)
+    applied_at = Column(DateTime, nullable=False)
+
+# 9. 감사 로그 (append-only, audit.py 가 모아서 한 번에 INSERT)
+class AuditLog(Base):
+    __tablename__ = 'audit_logs'
+
+    id = Column(Integer, primary_key=True, autoincrement=True)
+    occurred_at = Column(DateTime, nullable=False)
+    actor_id = Column(String(50), nullable=True)     # 변경한 사람 (모르면 NULL)
+    employee_id = Column(String(50), nullable=True)  # 대상 사원
+    action = Column(String(20), nullable=False)      # insert / update / delete / login / login_failed
+    entity = Column(String(50), nullable=False)      # 테이블 이름
+    entity_id = Column(String(100), nullable=True)
+    changes = Column(Text, nullable=True)            # {"컬럼": [변경 전, 변경 후]} JSON
+
+    __table_args__ = (
+        Index('ix_audit_logs_employee_time', 'employee_id', 'occurred_at'),
+        Index('ix_audit_logs_actor_time', 'actor_id', 'occurred_at'),
+        Index('ix_audit_logs_time', 'occurred_at'),
+    )
@@ -0,0 +1,229 @@
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from datetime import date, datetime, timedelta
+from typing import Dict, List, Tuple
+import argparse
+import calendar
+import hashlib
+import logging
+import time
+import zlib
+
+from sqlalchemy.orm import Session
+
+import archive
+import database
+import models
+from workdays import work_calendar, reload_holidays
+
+logger = logging.getLogger(__name__)
+
+# ==========================================
+#  월 마감 배치 (급여용 스냅샷)
+# ==========================================
+# 사원을 샤드로 나눠 프로세스 풀에서 병렬 계산하고, 샤드마다 한 트랜잭션으로
+# payroll_snapshots 에 기록합니다. 완료된 샤드는 month_close_shards 에 남아
+# 재실행 시 건너뛰므로 중간에 죽어도 같은 명령으로 이어서 돌릴 수 있습니다.
+
+LEAVE_TYPES = ["연차", "오전 반차", "오후 반차", "병가", "경조사 휴가"]
+
+
+def calc_work_seconds(att: models.Attendance) -> Tuple[float, float]:
+    """출퇴근 기록 한 건의 (근무 시간, 18시 이후 연장 시간) 초 단위"""
+    if not (att.attendance_in_time and att.attendance_out_time):
+        return 0.0, 0.0
+
+    t_in = datetime.combine(att.attendance_date, att.attendance_in_time)
+    t_out = datetime.combine(att.attendance_date, att.attendance_out_time)
+    work = (t_out - t_in).total_seconds()
+    over = 0.0
+    std_close = t_in.replace(hour=18, minute=0, second=0)
+    if t_out > std_close:
+        over = (t_out - max(t_in, std_close)).total_seconds()
+    return work, over
+
+
+def month_range(period: str) -> Tuple[date, date]:
+    year, month = map(int, period.split("-"))
+    _, last_day = calendar.monthrange(year, month)
+    return date(year, month, 1), date(year, month, last_day)
+
+
+def shard_of(employee_id: str, shard_count: int) -> int:
+    # 사원이 추가/퇴사해도 기존 사원의 샤드가 바뀌지 않도록 id 해시로 배정
+    return zlib.crc32(employee_id.encode("utf-8")) % shard_count
+
+
+def row_checksum(period: str, row: dict) -> str:
+    payload = "|".join(str(v) for v in [
+        period, row["employee_id"], row["work_minutes"], row["overtime_minutes"],
+        row["absence_days"], row["leave_days"],
+    ])
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+# --- 1. 샤드 계산 ---
+
+def compute_shard(db: Session, period: str, employee_ids: List[str]) -> List[dict]:
+    """샤드 전체를 출퇴근 1회 + 신청서 1회 벌크 조회로 계산"""
+    start, end = month_range(period)
+    month_start, month_end = datetime.combine(start, datetime.min.time()), datetime.combine(end, datetime.max.time())
+
+    shard_ids = set(employee_ids)
+
+    # 아카이브된 달을 다시 마감할 때를 위해 아카이브도 함께 읽음 (같은 id 가 양쪽에 있으면 DB 쪽 사용)
+    attendance = {a.attendance_id: a for a in archive.read_attendance(start, end) if a.employee_id in shard_ids}
+    attendance.update((a.attendance_id, a) for a in db.query(models.Attendance).filter(
+        models.Attendance.employee_id.in_(employee_ids),
+        models.Attendance.attendance_date.between(start, end)
+    ).all())
+
+    # 아카이브는 start_date 기준 파티션이라 이전 달에 시작해 이번 달까지 이어지는 휴가도 찾도록 1년 앞부터 읽음
+    archived_leaves = archive.read_applications(month_start - timedelta(days=366), month_end)
+    leaves = {
+        a.application_id: a for a in archived_leaves
+        if a.employee_id in shard_ids and a.status == "승인" and a.application_type in LEAVE_TYPES
+        and a.end_date >= month_start
+    }
+    leaves.update((a.application_id, a) for a in db.query(models.ApplicationModel).filter(
+        models.ApplicationModel.employee_id.in_(employee_ids),
+        models.ApplicationModel.status == "승인",
+        models.ApplicationModel.application_type.in_(LEAVE_TYPES),
+        models.ApplicationModel.start_date <= month_end,
+        models.ApplicationModel.end_date >= month_start
+    ).all())
+
+    rows: Dict[str, dict] = {
+        eid: {"employee_id": eid, "work_seconds": 0.0, "over_seconds": 0.0,
+              "attended_workdays": 0, "leave_days": 0.0, "leave_workdays": 0.0}
+        for eid in employee_ids
+    }
+
+    for att in attendance.values():
+        row = rows[att.employee_id]
+        work, over = calc_work_seconds(att)
+        row["work_seconds"] += work
+        row["over_seconds"] += over
+        if att.attendance_in_time and work_calendar.is_workday(att.attendance_date):
+            row["attended_workdays"] += 1
+
+    for app in leaves.values():
+        # 이번 달에 걸친 부분만 사용량으로 계산
+        days = work_calendar.leave_days(max(app.start_date, month_start), min(app.end_date, month_end), app.application_type)
+        rows[app.employee_id]["leave_days"] += days
+        if days >= 1:
+            rows[app.employee_id]["leave_workdays"] += days
+
+    month_workdays = work_calendar.count_workdays(start, end)
+    result = []
+    for eid in sorted(rows):
+        row = rows[eid]
+        snapshot = {
+            "employee_id": eid,
+            "work_minutes": int(row["work_seconds"] // 60),
+            "overtime_minutes": int(row["over_seconds"] // 60),
+            "absence_days": max(0, int(month_workdays - row["attended_workdays"] - row["leave_workdays"])),
+            "leave_days": row["leave_days"],
+        }
+        snapshot["checksum"] = row_checksum(period, snapshot)
+        result.append(snapshot)
+    return result
+
+
+def close_shard(period: str, shard_no: int, shard_count: int, employee_ids: List[str]) -> Tuple[int, int]:
+    """샤드 한 개를 계산해서 한 트랜잭션으로 기록. (샤드 번호, 처리 사원 수) 리턴"""
+    db = database.SessionLocal()
+    try:
+        done = db.query(models.MonthCloseShard).filter(
+            models.MonthCloseShard.period == period,
+            models.MonthCloseShard.shard_no == shard_no
+        ).first()
+        if done:
+            return shard_no, 0
+
+        rows = compute_shard(db, period, employee_ids) if employee_ids else []
+        closed_at = datetime.now()
+        for row in rows:
+            db.add(models.PayrollSnapshot(period=period, shard_no=shard_no, closed_at=closed_at, **row))
+
+        shard_checksum = hashlib.sha256("".join(r["checksum"] for r in rows).encode("utf-8")).hexdigest()
+        db.add(models.MonthCloseShard(
+            period=period, shard_no=shard_no, shard_count=shard_count,
+            employee_count=len(rows), checksum=shard_checksum, finished_at=closed_at
+        ))
+        db.commit()
+        return shard_no, len(rows)
+    except Exception:
+        db.rollback()
+        raise
+    finally:
+        db.close()
+
+
+def _init_worker():
+    # 부모 프로세스의 커넥션을 물려받지 않도록 풀을 비우고, 회사 휴일을 다시 로드
+    database.engine.dispose()
+    reload_holidays()
+
+
+# --- 2. 마감 실행 ---
+
+def run_month_close(period: str, workers: int = 4, shard_count: int = 16) -> dict:
+    _, last_day = month_range(period)
+    # 끝나지 않은 달을 마감하면 남은 근무일이 결근으로 고정되고, 재실행해도 완료된 샤드는 건너뛰므로 막음
+    if last_day >= date.today():
+        raise ValueError(f"{period} 은(는) 아직 끝나지 않은 달입니다.")
+    started = time.perf_counter()
+
+    db = database.SessionLocal()
+    try:
+        prev = db.query(models.MonthCloseShard.shard_count).filter(models.MonthCloseShard.period == period).first()
+        if prev and prev[0] != shard_count:
+            # 샤드 수가 바뀌면 이미 기록된 샤드와 사원이 겹칠 수 있으므로 기존 값으로 이어서 진행
+            logger.warning("%s 은(는) 샤드 %d개로 진행 중이던 마감입니다. 같은 샤드 수로 이어서 실행합니다.", period, prev[0])
+            shard_count = prev[0]
+        employee_ids = [r.employee_id for r in db.query(models.Employee.employee_id).all()]
+    finally:
+        db.close()
+
+    shards: Dict[int, List[str]] = {i: [] for i in range(shard_count)}
+    for eid in employee_ids:
+        shards[shard_of(eid, shard_count)].append(eid)
+
+    processed = 0
+    with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker) as pool:
+        futures = [pool.submit(close_shard, period, no, shard_count, ids) for no, ids in shards.items()]
+        for future in as_completed(futures):
+            shard_no, count = future.result()
+            processed += count
+            logger.info("샤드 %d/%d 완료 (%d명)", shard_no + 1, shard_count, count)
+
+    elapsed = time.perf_counter() - started
+    return {
+        "period": period,
+        "employees": processed,
+        "seconds": round(elapsed, 2),
+        "employees_per_sec": round(processed / elapsed, 1) if elapsed > 0 else 0.0,
+    }
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO)
+
+    parser = argparse.ArgumentParser(description="월 마감: 사원별 근무/연장/결근/휴가 사용량을 급여 스냅샷으로 고정")
+    parser.add_argument("period", nargs="?", help="마감 월 (YYYY-MM, 기본값: 지난달)")
+    parser.add_argument("--workers", type=int, default=4, help="프로세스 수")
+    parser.add_argument("--shards", type=int, default=16, help="샤드 수")
+    args = parser.parse_args()
+
+    period = args.period
+    if not period:
+        first_of_month = date.today().replace(day=1)
+        last_month = date.fromordinal(first_of_month.toordinal() - 1)
+        period = last_month.strftime("%Y-%m")
+
+    try:
+        report = run_month_close(period, workers=args.workers, shard_count=args.shards)
+    except ValueError as e:
+        parser.error(str(e))
+    print(f"✅ {report['period']} 마감 완료: {report['employees']}명 / {report['seconds']}초 "
+          f"({report['employees_per_sec']}명/초)")
@@ -10,8 +10,9 @@ try:
     Base.metadata.drop_all(bind=engine)
     print("✅ 기존 테이블 삭제 완료!")
 
-    # 새 테이블 생성 (password 컬럼 포함됨)
-    Base.metadata.create_all(bind=engine)
+    # 새 테이블 생성 (password 컬럼 포함됨) + 스키마 버전 기록
+    import bootstrap
+    bootstrap.ensure_schema()
     print("✅ 새 테이블 생성 완료!")
     
     print("🎉 DB 초기화 성공! 이제 서버를 켜고 유저를 다시 등록하세요.")
@@ -0,0 +1,175 @@
+from datetime import datetime, timedelta
+from typing import Dict, Optional, Set
+import calendar
+import hashlib
+import logging
+import math
+import os
+import threading
+
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session
+
+import database
+import models
+
+logger = logging.getLogger(__name__)
+
+# ==========================================
+#  토큰 폐기 목록 (메모리)
+# ==========================================
+# 요청마다 DB 를 보지 않도록 폐기된 토큰 id(jti)를 블룸 필터 + 정확한 집합으로 들고 있고,
+# token_revocations 테이블에서 짧은 주기로 새 행만 가져와 반영합니다.
+# jti 가 없는 행은 "그 시각 이전에 발급된 해당 사원의 모든 토큰" 폐기(퇴사/강제 로그아웃)입니다.
+
+SYNC_INTERVAL_SECONDS = int(os.getenv("HR_REVOCATION_SYNC_SECONDS", 5))
+FULL_RELOAD_SECONDS = 600
+# 증분 동기화 때 지난 동기화 시각보다 이만큼 앞선 행부터 다시 읽음
+# (revoked_at 은 커밋 전에 찍히므로 늦게 커밋된 행, 워커 간 시계 차이를 놓치지 않도록)
+SYNC_OVERLAP_SECONDS = 60
+
+
+def to_epoch(dt: datetime) -> int:
+    """naive UTC datetime -> epoch 초"""
+    return calendar.timegm(dt.utctimetuple())
+
+
+class BloomFilter:
+    def __init__(self, capacity: int = 100000, error_rate: float = 0.001):
+        self.size = max(8, int(-capacity * math.log(error_rate) / (math.log(2) ** 2)))
+        self.hash_count = max(1, int(round(self.size / capacity * math.log(2))))
+        self._bits = bytearray((self.size + 7) // 8)
+
+    def _positions(self, key: str):
+        digest = hashlib.blake2b(key.encode("utf-8"), digest_size=16).digest()
+        h1 = int.from_bytes(digest[:8], "little")
+        h2 = int.from_bytes(digest[8:], "little") | 1
+        for i in range(self.hash_count):
+            yield (h1 + i * h2) % self.size
+
+    def add(self, key: str):
+        for pos in self._positions(key):
+            self._bits[pos >> 3] |= 1 << (pos & 7)
+
+    def __contains__(self, key: str) -> bool:
+        return all(self._bits[pos >> 3] & (1 << (pos & 7)) for pos in self._positions(key))
+
+
+def _add(row: models.TokenRevocation, bloom: BloomFilter, exact: Set[str], subjects: Dict[str, int]):
+    if row.jti:
+        bloom.add(row.jti)
+        exact.add(row.jti)
+    else:
+        epoch = to_epoch(row.revoked_at)
+        subjects[row.employee_id] = max(subjects.get(row.employee_id, 0), epoch)
+
+
+class RevocationList:
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._bloom = BloomFilter()
+        self._exact: Set[str] = set()
+        self._subjects: Dict[str, int] = {}  # employee_id -> 이 시각(epoch) 이전 발급 토큰 무효
+        self._synced_at: Optional[datetime] = None
+        self._last_full: Optional[datetime] = None
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    # --- 조회 (요청마다 호출, DB 접근 없음) ---
+
+    def is_revoked(self, jti: Optional[str], employee_id: str, issued_at: int) -> bool:
+        before = self._subjects.get(employee_id)
+        # iat 는 초 단위라 폐기와 같은 초에 발급된 토큰도 폐기된 것으로 봄
+        if before is not None and issued_at <= before:
+            return True
+        # 블룸 필터에 없으면 확실히 폐기되지 않은 토큰, 있으면 정확한 집합으로 재확인
+        return bool(jti) and jti in self._bloom and jti in self._exact
+
+    # --- 반영 ---
+
+    def _apply(self, row: models.TokenRevocation):
+        _add(row, self._bloom, self._exact, self._subjects)
+
+    def revoke(self, db: Session, employee_id: str, jti: Optional[str] = None, expires_at: Optional[datetime] = None) -> bool:
+        """폐기 기록 (DB 에 남기고 이 프로세스에는 바로 반영, 다른 워커는 다음 동기화 때 반영)
+        같은 jti 가 이미 폐기돼 있으면 False (어느 워커에서든 먼저 INSERT 한 쪽만 True)"""
+        row = models.TokenRevocation(
+            jti=jti,
+            employee_id=employee_id,
+            revoked_at=datetime.utcnow(),
+            expires_at=expires_at or datetime.utcnow() + timedelta(days=30),
+        )
+        db.add(row)
+        try:
+            db.commit()
+        except IntegrityError:
+            db.rollback()
+            with self._lock:
+                self._apply(row)
+            return False
+        with self._lock:
+            self._apply(row)
+        return True
+
+    def sync(self, db: Session):
+        now = datetime.utcnow()
+        full = self._last_full is None or (now - self._last_full).total_seconds() >= FULL_RELOAD_SECONDS
+
+        q = db.query(models.TokenRevocation).filter(models.TokenRevocation.expires_at > now)
+        if not full:
+            # id 는 커밋 순서대로 보이지 않으므로(MySQL auto-increment) revoked_at 기준으로 겹치게 읽음
+            # 이미 반영한 행을 다시 반영해도 결과는 같음
+            q = q.filter(models.TokenRevocation.revoked_at >= self._synced_at - timedelta(seconds=SYNC_OVERLAP_SECONDS))
+
+        # 조회부터 반영까지 잠금 안에서 진행 (그 사이 revoke() 로 반영된 항목이 새 목록에서 빠지지 않도록)
+        with self._lock:
+            rows = q.all()
+            if full:
+                # 만료된 폐기 기록을 털어내기 위해 주기적으로 새로 만든 뒤 한 번에 교체
+                # (is_revoked 는 잠금 없이 읽으므로 기존 목록을 비우고 다시 채우면 그 사이 폐기된 토큰이 통과함)
+                bloom, exact, subjects = BloomFilter(), set(), {}
+                for row in rows:
+                    _add(row, bloom, exact, subjects)
+                self._bloom, self._exact, self._subjects = bloom, exact, subjects
+                self._last_full = now
+            else:
+                for row in rows:
+                    self._apply(row)
+            self._synced_at = now
+
+    # --- 주기 동기화 스레드 ---
+
+    def _loop(self):
+        while not self._stop.wait(SYNC_INTERVAL_SECONDS):
+            self._sync_once()
+
+    def _sync_once(self):
+        db = database.SessionLocal()
+        try:
+            self.sync(db)
+        except Exception as e:
+            logger.warning("토큰 폐기 목록 동기화 실패: %s", e)
+        finally:
+            db.close()
+
+    def start(self):
+        # 첫 적재는 실패하면 예외를 올려 준비 상태가 되지 않도록 함 (빈 목록으로 토큰을 받아주지 않게)
+        db = database.SessionLocal()
+        try:
+            self.sync(db)
+        finally:
+            db.close()
+        if self._thread is None:
+            self._stop.clear()
+            self._thread = threading.Thread(target=self._loop, name="hr-revocation-sync", daemon=True)
+            self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout=SYNC_INTERVAL_SECONDS)
+            self._thread = None
+
+
+# 앱 전체에서 공유하는 폐기 목록
+revocation_list = RevocationList()
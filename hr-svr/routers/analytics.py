@@ -0,0 +1,261 @@
+from datetime import date, datetime, time, timedelta
+from typing import Dict, List, Optional
+import threading
+import time as _time
+
+from fastapi import APIRouter, Depends, HTTPException
+from sqlalchemy import Integer, and_, case, cast, event, func, inspect
+from sqlalchemy.orm import Session
+
+import archive
+import database
+import models
+from jobs import job_queue
+from month_close import calc_work_seconds
+
+router = APIRouter()
+
+# 지각 기준 / 정시 퇴근 기준 (초)
+LATE_AFTER = time(9, 0)
+STD_CLOSE_SEC = 18 * 3600
+NO_DEPARTMENT = "미지정"
+
+
+# ==========================================
+#  주 단위 버킷 캐시
+# ==========================================
+# 지난 주(마감된 주)는 보관해 두고, 이번 주처럼 아직 진행 중인 주만 매번 다시 계산합니다.
+# 지난 출퇴근 기록 수정/아카이브 이동/사원 부서 변경이 커밋되면 해당 주(또는 전체)를 비우고,
+# 다른 워커에서 바뀐 것은 알 수 없으므로 보관 기간(CLOSED_WEEK_TTL_SECONDS)이 지나면 다시 계산합니다.
+# 비운 주는 커밋 후 백그라운드 작업으로 다시 집계해 두어 다음 조회가 요청 안에서 집계하지 않게 합니다.
+
+CLOSED_WEEK_TTL_SECONDS = 600
+_STALE_KEY = "stale_analytics_weeks"
+
+
+class WeeklyBucketCache:
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._closed: Dict[date, tuple] = {}  # 주 시작일 -> (저장 시각, 부서별 버킷)
+
+    def get(self, week_start: date) -> Optional[Dict[str, dict]]:
+        with self._lock:
+            entry = self._closed.get(week_start)
+        if entry is None or _time.monotonic() - entry[0] > CLOSED_WEEK_TTL_SECONDS:
+            return None
+        return entry[1]
+
+    def put(self, week_start: date, buckets: Dict[str, dict]):
+        if week_start + timedelta(days=6) >= date.today():
+            return  # 진행 중인 주는 보관하지 않음
+        with self._lock:
+            self._closed[week_start] = (_time.monotonic(), buckets)
+
+    def invalidate(self, day: date):
+        """지난 출퇴근 기록을 수정했을 때 해당 주만 다시 계산하도록 제거"""
+        with self._lock:
+            self._closed.pop(week_of(day), None)
+
+    def clear(self):
+        with self._lock:
+            self._closed.clear()
+
+
+weekly_cache = WeeklyBucketCache()
+
+
+def week_of(d: date) -> date:
+    return d - timedelta(days=d.weekday())
+
+
+# --- 캐시 무효화 (커밋된 변경만 반영) ---
+
+@event.listens_for(database.SessionLocal, "after_flush")
+def _collect_stale_weeks(session: Session, flush_context):
+    stale = session.info.setdefault(_STALE_KEY, set())
+    for obj in list(session.new) + list(session.dirty) + list(session.deleted):
+        if isinstance(obj, models.Attendance):
+            # 날짜를 옮긴 경우 옮기기 전 주도 비움
+            history = inspect(obj).attrs.attendance_date.history
+            for d in list(history.added) + list(history.unchanged) + list(history.deleted):
+                if d is not None:
+                    stale.add(d)
+        elif isinstance(obj, models.Employee) and inspect(obj).attrs.department.history.deleted:
+            stale.add(None)  # 부서가 바뀌면 그 사원이 있던 모든 주가 바뀌므로 전체 비움
+
+
+@event.listens_for(database.SessionLocal, "after_bulk_delete")
+def _collect_bulk_delete(delete_context):
+    # 아카이브 이동 (핫 테이블 일괄 삭제)
+    if delete_context.mapper.class_ is models.Attendance:
+        delete_context.session.info.setdefault(_STALE_KEY, set()).add(None)
+
+
+@event.listens_for(database.SessionLocal, "after_commit")
+def _invalidate_stale_weeks(session: Session):
+    stale = session.info.pop(_STALE_KEY, None)
+    if not stale:
+        return
+    if None in stale:
+        weekly_cache.clear()
+        return
+    for d in stale:
+        weekly_cache.invalidate(d)
+    closed = {week_of(d) for d in stale if week_of(d) + timedelta(days=6) < date.today()}
+    if closed:
+        job_queue.submit(rebuild_weeks, sorted(closed))
+
+
+@event.listens_for(database.SessionLocal, "after_soft_rollback")
+def _drop_stale_weeks(session: Session, previous_transaction):
+    session.info.pop(_STALE_KEY, None)
+
+
+def _empty_bucket() -> dict:
+    return {"records": 0, "clocked_in": 0, "late": 0, "completed": 0, "work_sec": 0, "over_sec": 0}
+
+
+def _seconds_of(db: Session, col):
+    """TIME 컬럼을 자정 기준 초로 변환 (DB 종류별 함수 차이 흡수)"""
+    if db.bind.dialect.name == "sqlite":
+        return (cast(func.strftime("%H", col), Integer) * 3600
+                + cast(func.strftime("%M", col), Integer) * 60
+                + cast(func.strftime("%S", col), Integer))
+    return func.time_to_sec(col)
+
+
+# --- 1. 집계 ---
+
+def _aggregate_hot(db: Session, start: date, end: date, weeks: Dict[date, Dict[str, dict]]):
+    """핫 테이블: 부서 x 날짜 단위 GROUP BY 결과를 주 버킷에 누적"""
+    A = models.Attendance
+    in_sec = _seconds_of(db, A.attendance_in_time)
+    out_sec = _seconds_of(db, A.attendance_out_time)
+    completed = and_(A.attendance_in_time.isnot(None), A.attendance_out_time.isnot(None))
+    overtime = case(
+        (and_(completed, out_sec > STD_CLOSE_SEC),
+         case((in_sec > STD_CLOSE_SEC, out_sec - in_sec), else_=out_sec - STD_CLOSE_SEC)),
+        else_=0
+    )
+
+    rows = db.query(
+        models.Employee.department,
+        A.attendance_date,
+        func.count(A.attendance_id),
+        func.sum(case((A.attendance_in_time.isnot(None), 1), else_=0)),
+        func.sum(case((A.attendance_in_time > LATE_AFTER, 1), else_=0)),
+        func.sum(case((completed, 1), else_=0)),
+        func.sum(case((completed, out_sec - in_sec), else_=0)),
+        func.sum(overtime),
+    ).outerjoin(
+        models.Employee, A.employee_id == models.Employee.employee_id
+    ).filter(
+        A.attendance_date.between(start, end)
+    ).group_by(models.Employee.department, A.attendance_date).all()
+
+    for dept, day, records, clocked_in, late, done, work_sec, over_sec in rows:
+        bucket = weeks[week_of(day)].setdefault(dept or NO_DEPARTMENT, _empty_bucket())
+        bucket["records"] += records or 0
+        bucket["clocked_in"] += int(clocked_in or 0)
+        bucket["late"] += int(late or 0)
+        bucket["completed"] += int(done or 0)
+        bucket["work_sec"] += int(work_sec or 0)
+        bucket["over_sec"] += int(over_sec or 0)
+
+
+def _aggregate_archived(db: Session, start: date, end: date, weeks: Dict[date, Dict[str, dict]]):
+    """아카이브된 연도: Parquet 에서 읽어 같은 기준으로 누적 (마감된 주라 한 번만 계산됨)"""
+    rows = archive.read_attendance(start, end)
+    if not rows:
+        return
+
+    ids = {r.employee_id for r in rows}
+    depts = dict(db.query(models.Employee.employee_id, models.Employee.department).filter(
+        models.Employee.employee_id.in_(ids)
+    ).all())
+
+    for att in rows:
+        bucket = weeks[week_of(att.attendance_date)].setdefault(depts.get(att.employee_id) or NO_DEPARTMENT, _empty_bucket())
+        bucket["records"] += 1
+        if att.attendance_in_time:
+            bucket["clocked_in"] += 1
+            if att.attendance_in_time > LATE_AFTER:
+                bucket["late"] += 1
+        if att.attendance_in_time and att.attendance_out_time:
+            work, over = calc_work_seconds(att)
+            bucket["completed"] += 1
+            bucket["work_sec"] += int(work)
+            bucket["over_sec"] += int(over)
+
+
+def weekly_buckets(db: Session, week_starts: List[date]) -> Dict[date, Dict[str, dict]]:
+    result: Dict[date, Dict[str, dict]] = {}
+    missing = []
+    for w in week_starts:
+        cached = weekly_cache.get(w)
+        if cached is not None:
+            result[w] = cached
+        else:
+            missing.append(w)
+
+    if missing:
+        # 캐시에 없는 주들을 한 번의 GROUP BY 로 계산
+        start, end = missing[0], missing[-1] + timedelta(days=6)
+        computed = {start + timedelta(weeks=i): {} for i in range((end - start).days // 7 + 1)}
+        _aggregate_hot(db, start, end, computed)
+        _aggregate_archived(db, start, end, computed)
+
+        for w, buckets in computed.items():
+            weekly_cache.put(w, buckets)
+            if w in missing:
+                result[w] = buckets
+    return result
+
+
+def rebuild_weeks(week_starts: List[date]):
+    """무효화된 지난 주 버킷을 다시 집계해 캐시에 넣음 (백그라운드 작업)"""
+    db = database.SessionLocal()
+    try:
+        for w in week_starts:
+            weekly_buckets(db, [w])
+    finally:
+        db.close()
+
+
+# --- 2. API ---
+
+# 1. 부서별 주간 근태 통계 (지각률, 평균 근무시간, 연장근무)
+@router.get("/attendance/departments")
+def get_department_weekly_stats(
+    start: Optional[str] = None,
+    end: Optional[str] = None,
+    department: Optional[str] = None,
+    db: Session = Depends(database.get_db)
+):
+    try:
+        end_date = datetime.strptime(end, "%Y-%m-%d").date() if end else date.today()
+        start_date = datetime.strptime(start, "%Y-%m-%d").date() if start else end_date - timedelta(weeks=11)
+    except ValueError:
+        raise HTTPException(status_code=400, detail="날짜 형식이 올바르지 않습니다. (YYYY-MM-DD)")
+    if start_date > end_date:
+        raise HTTPException(status_code=400, detail="시작일이 종료일보다 늦습니다.")
+
+    first, last = week_of(start_date), week_of(end_date)
+    week_starts = [first + timedelta(weeks=i) for i in range((last - first).days // 7 + 1)]
+    buckets = weekly_buckets(db, week_starts)
+
+    result = []
+    for w in week_starts:
+        for dept, b in sorted(buckets[w].items()):
+            if department and dept != department:
+                continue
+            result.append({
+                "week": w.strftime("%Y-%m-%d"),
+                "department": dept,
+                "records": b["records"],
+                "lateCount": b["late"],
+                "lateRate": round(b["late"] / b["clocked_in"], 4) if b["clocked_in"] else 0.0,
+                "avgWorkHours": round(b["work_sec"] / b["completed"] / 3600, 2) if b["completed"] else 0.0,
+                "overtimeHours": round(b["over_sec"] / 3600, 2),
+            })
+    return result
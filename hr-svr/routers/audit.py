@@ -0,0 +1,84 @@
+from datetime import date, datetime, timedelta
+from typing import Optional
+import json
+
+from fastapi import APIRouter, Depends, HTTPException, Query
+from sqlalchemy import and_, or_
+from sqlalchemy.orm import Session
+
+import database
+import models
+from routers.auth import get_admin_user
+
+router = APIRouter()
+
+MAX_PAGE_SIZE = 200
+
+def parse_date(d_str: str) -> date:
+    try:
+        return datetime.strptime(d_str, "%Y-%m-%d").date()
+    except ValueError:
+        raise HTTPException(status_code=400, detail="날짜 형식이 올바르지 않습니다. (YYYY-MM-DD)")
+
+def encode_cursor(log: models.AuditLog) -> str:
+    return f"{log.occurred_at.isoformat()}_{log.id}"
+
+def decode_cursor(cursor: str):
+    try:
+        occurred_at, log_id = cursor.rsplit("_", 1)
+        return datetime.fromisoformat(occurred_at), int(log_id)
+    except ValueError:
+        raise HTTPException(status_code=400, detail="cursor 값이 올바르지 않습니다.")
+
+def to_dict(log: models.AuditLog) -> dict:
+    return {
+        "id": log.id,
+        "occurred_at": log.occurred_at.strftime("%Y-%m-%d %H:%M:%S"),
+        "actor_id": log.actor_id,
+        "employee_id": log.employee_id,
+        "action": log.action,
+        "entity": log.entity,
+        "entity_id": log.entity_id,
+        "changes": json.loads(log.changes) if log.changes else {},
+    }
+
+# 1. [관리자용] 감사 로그 조회 (최신순, cursor 로 다음 페이지). 사원 정보 변경 전후 값이 있으므로 관리자만
+# 사원/기간으로 거르면 (employee_id, occurred_at) 인덱스를 타고, 페이지가 깊어져도 OFFSET 으로 건너뛰지 않음
+@router.get("")
+def get_audit_logs(
+    employee_id: Optional[str] = None,
+    actor_id: Optional[str] = None,
+    action: Optional[str] = None,
+    start: Optional[str] = None,
+    end: Optional[str] = None,
+    cursor: Optional[str] = None,
+    size: int = Query(50, ge=1, le=MAX_PAGE_SIZE),
+    db: Session = Depends(database.get_db),
+    admin=Depends(get_admin_user),
+):
+    q = db.query(models.AuditLog)
+    if employee_id:
+        q = q.filter(models.AuditLog.employee_id == employee_id)
+    if actor_id:
+        q = q.filter(models.AuditLog.actor_id == actor_id)
+    if action:
+        q = q.filter(models.AuditLog.action == action)
+    if start:
+        q = q.filter(models.AuditLog.occurred_at >= datetime.combine(parse_date(start), datetime.min.time()))
+    if end:
+        q = q.filter(models.AuditLog.occurred_at < datetime.combine(parse_date(end) + timedelta(days=1), datetime.min.time()))
+    if cursor:
+        before_at, before_id = decode_cursor(cursor)
+        q = q.filter(or_(
+            models.AuditLog.occurred_at < before_at,
+            and_(models.AuditLog.occurred_at == before_at, models.AuditLog.id < before_id),
+        ))
+
+    logs = q.order_by(models.AuditLog.occurred_at.desc(), models.AuditLog.id.desc()).limit(size + 1).all()
+    has_more = len(logs) > size
+    logs = logs[:size]
+
+    return {
+        "items": [to_dict(log) for log in logs],
+        "next_cursor": encode_cursor(logs[-1]) if has_more else None,
+    }
@@ -1,5 +1,7 @@
 from datetime import datetime, timedelta
-from typing import Union
+from typing import Optional, Union
+import os
+import uuid
 from fastapi import APIRouter, Depends, HTTPException, status
 from fastapi.security import OAuth2PasswordBearer, OAuth2PasswordRequestForm
 from sqlalchemy.orm import Session
@@ -7,24 +9,36 @@ from passlib.context import CryptContext
 from jose import JWTError, jwt
 from pydantic import BaseModel
 
+import bootstrap
 import database
 import models
+from directory import employee_directory
+from audit import audit_writer, ACTOR_KEY
+from revocation import revocation_list, to_epoch
 
 # --- 설정 (보안상 실제 배포 시에는 환경변수로 숨겨야 합니다) ---
 SECRET_KEY = "my_super_secret_key_change_this"  # 임의의 긴 문자열로 변경하세요
 ALGORITHM = "HS256"
-ACCESS_TOKEN_EXPIRE_MINUTES = 60 * 24 
+ACCESS_TOKEN_EXPIRE_MINUTES = 15
+REFRESH_TOKEN_EXPIRE_DAYS = 14
+# 관리자 사번 (쉼표로 구분, 다른 사원의 토큰 일괄 폐기 등에 필요)
+ADMIN_EMPLOYEE_IDS = {e.strip() for e in os.getenv("HR_ADMIN_EMPLOYEE_IDS", "").split(",") if e.strip()}
 # --- 보안 도구 설정 ---
 pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl="/api/auth/login")
+optional_oauth2_scheme = OAuth2PasswordBearer(tokenUrl="/api/auth/login", auto_error=False)
 
 router = APIRouter()
 
 # --- 토큰 응답 스키마 ---
 class Token(BaseModel):
     access_token: str
+    refresh_token: str
     token_type: str
 
+class RefreshRequest(BaseModel):
+    refresh_token: str
+
 # 테스트 회원가입용 데이터 스키마
 class UserCreate(BaseModel):
     employee_id: str
@@ -44,15 +58,55 @@ def get_password_hash(password):
 def create_access_token(data: dict, expires_delta: Union[timedelta, None] = None):
     """JWT 토큰 생성"""
     to_encode = data.copy()
+    now = datetime.utcnow()
     if expires_delta:
-        expire = datetime.utcnow() + expires_delta
+        expire = now + expires_delta
     else:
-        expire = datetime.utcnow() + timedelta(minutes=15)
+        expire = now + timedelta(minutes=15)
     
-    to_encode.update({"exp": expire})
+    # jti: 토큰 하나를 폐기할 때 쓰는 고유 id / iat: 사원 단위 일괄 폐기 비교용
+    to_encode.setdefault("type", "access")
+    to_encode.update({"exp": expire, "iat": to_epoch(now), "jti": uuid.uuid4().hex})
     encoded_jwt = jwt.encode(to_encode, SECRET_KEY, algorithm=ALGORITHM)
     return encoded_jwt
 
+def create_token_pair(employee_id: str) -> dict:
+    """짧은 액세스 토큰 + 긴 리프레시 토큰 발급"""
+    access_token = create_access_token(
+        data={"sub": employee_id}, expires_delta=timedelta(minutes=ACCESS_TOKEN_EXPIRE_MINUTES)
+    )
+    refresh_token = create_access_token(
+        data={"sub": employee_id, "type": "refresh"}, expires_delta=timedelta(days=REFRESH_TOKEN_EXPIRE_DAYS)
+    )
+    return {"access_token": access_token, "refresh_token": refresh_token, "token_type": "bearer"}
+
+def decode_token(token: str, token_type: str) -> dict:
+    """서명/만료/종류/폐기 여부 확인 후 payload 리턴 (DB 조회 없음)"""
+    credentials_exception = HTTPException(
+        status_code=status.HTTP_401_UNAUTHORIZED,
+        detail="자격 증명을 확인할 수 없습니다.",
+        headers={"WWW-Authenticate": "Bearer"},
+    )
+
+    try:
+        payload = jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM])
+    except JWTError:
+        raise credentials_exception
+
+    user_id = payload.get("sub")
+    if user_id is None or payload.get("type", "access") != token_type:
+        raise credentials_exception
+    # 폐기 목록을 아직 못 읽었으면 폐기된 토큰을 통과시킬 수 있으므로 받지 않음
+    if not bootstrap.readiness.steps["revocations"]:
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="서버를 준비하는 중입니다. 잠시 후 다시 시도하세요.",
+            headers={"Retry-After": "1"},
+        )
+    if revocation_list.is_revoked(payload.get("jti"), user_id, payload.get("iat", 0)):
+        raise credentials_exception
+    return payload
+
 # --- 2. 로그인 API (토큰 발급) ---
 
 @router.post("/login", response_model=Token)
@@ -60,29 +114,71 @@ def login_for_access_token(form_data: OAuth2PasswordRequestForm = Depends(), db:
     # 1. DB에서 사용자 찾기 (form_data.username에는 사번(ID)이 들어옵니다)
     user = db.query(models.Employee).filter(models.Employee.employee_id == form_data.username).first()
     
-    # 2. 사용자가 없거나 비밀번호가 틀리면 에러
-    if not user or not user.password:
+    # 2. 사용자가 없거나 비밀번호가 틀리면 에러 (실패도 감사 로그에 남김)
+    if not user or not user.password or not verify_password(form_data.password, user.password):
+        audit_writer.record("login_failed", form_data.username)
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="아이디 또는 비밀번호가 일치하지 않습니다.",
             headers={"WWW-Authenticate": "Bearer"},
         )
     
-    # 3. 비밀번호 검증 (입력받은 것 vs DB에 있는 것)
-    if not verify_password(form_data.password, user.password):
+    # 3. 인증 성공 시 토큰 생성 (액세스 + 리프레시)
+    audit_writer.record("login", user.employee_id, actor_id=user.employee_id)
+    return create_token_pair(user.employee_id)
+
+# --- 3. 토큰 재발급 (리프레시 토큰 1회용, 사용 시 교체) ---
+@router.post("/refresh", response_model=Token)
+def refresh_access_token(req: RefreshRequest, db: Session = Depends(database.get_db)):
+    payload = decode_token(req.refresh_token, "refresh")
+    user_id = payload["sub"]
+
+    # 퇴사 처리된 사원은 재발급하지 않음
+    emp = employee_directory.lookup(db, [user_id]).get(user_id)
+    if emp is None or emp.status == "퇴사":
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
-            detail="아이디 또는 비밀번호가 일치하지 않습니다.",
+            detail="자격 증명을 확인할 수 없습니다.",
             headers={"WWW-Authenticate": "Bearer"},
         )
-    
-    # 4. 인증 성공 시 토큰 생성
-    access_token_expires = timedelta(minutes=ACCESS_TOKEN_EXPIRE_MINUTES)
-    access_token = create_access_token(
-        data={"sub": user.employee_id}, expires_delta=access_token_expires
-    )
-    
-    return {"access_token": access_token, "token_type": "bearer"}
+
+    # 같은 리프레시 토큰으로 동시에(다른 워커 포함) 재발급하면 먼저 폐기 기록을 남긴 쪽만 성공
+    if not revocation_list.revoke(db, user_id, jti=payload["jti"], expires_at=datetime.utcfromtimestamp(payload["exp"])):
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="이미 사용된 리프레시 토큰입니다.",
+            headers={"WWW-Authenticate": "Bearer"},
+        )
+    return create_token_pair(user_id)
+
+# --- 4. 로그아웃 (리프레시 토큰 + 아직 살아 있는 액세스 토큰 폐기) ---
+# 액세스 토큰은 15분이면 만료되므로 리프레시 토큰만으로도 로그아웃(폐기)할 수 있어야 함
+def _decode_signed(token: str, token_type: str) -> Optional[dict]:
+    """서명/만료만 확인 (폐기 여부는 보지 않음). 잘못된 토큰이면 None"""
+    try:
+        payload = jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM])
+    except JWTError:
+        return None
+    if payload.get("type", "access") != token_type or not payload.get("sub") or not payload.get("jti"):
+        return None
+    return payload
+
+def _revoke_token(db: Session, payload: dict):
+    # 이미 폐기된 토큰이면 revoke 가 False 를 돌려줄 뿐이므로 그대로 둠
+    revocation_list.revoke(db, payload["sub"], jti=payload["jti"], expires_at=datetime.utcfromtimestamp(payload["exp"]))
+
+@router.post("/logout")
+def logout(req: RefreshRequest, token: Optional[str] = Depends(optional_oauth2_scheme), db: Session = Depends(database.get_db)):
+    refresh = _decode_signed(req.refresh_token, "refresh")
+    access = _decode_signed(token, "access") if token else None
+
+    if refresh:
+        _revoke_token(db, refresh)
+    # 액세스 토큰은 같은 사원의 것일 때만 함께 폐기 (이미 만료된 것은 폐기할 필요 없음)
+    if access and (refresh is None or access["sub"] == refresh["sub"]):
+        _revoke_token(db, access)
+
+    return {"message": "로그아웃되었습니다."}
 
 # --- 테스트용 회원가입 API ---
 @router.post("/signup-test")
@@ -114,6 +210,7 @@ def create_test_user(user: UserCreate, db: Session = Depends(database.get_db)):
 
 # 현재 로그인한 사용자 가져오기 (의존성 함수) 
 
+# 토큰 검증과 폐기 확인은 메모리에서 끝내고, 사원 정보는 사원 디렉터리에서 가져옴 (요청마다 DB 조회 없음)
 def get_current_user(token: str = Depends(oauth2_scheme), db: Session = Depends(database.get_db)):
     credentials_exception = HTTPException(
         status_code=status.HTTP_401_UNAUTHORIZED,
@@ -121,16 +218,41 @@ def get_current_user(token: str = Depends(oauth2_scheme), db: Session = Depends(
         headers={"WWW-Authenticate": "Bearer"},
     )
     
-    try:
-        payload = jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM])
-        user_id: str = payload.get("sub")
-        if user_id is None:
-            raise credentials_exception
-    except JWTError:
-        raise credentials_exception
+    payload = decode_token(token, "access")
+    user_id: str = payload["sub"]
         
-    user = db.query(models.Employee).filter(models.Employee.employee_id == user_id).first()
-    if user is None:
+    user = employee_directory.lookup(db, [user_id]).get(user_id)
+    if user is None or user.status == "퇴사":
         raise credentials_exception
-        
-    return user
\ No newline at end of file
+
+    # 이 세션에서 일어나는 변경은 이 사원이 한 것으로 감사 로그에 기록
+    db.info[ACTOR_KEY] = user_id
+    return user
+
+# 로그인이 필수가 아닌 API 에서 변경자만 감사 로그에 남기기 위한 의존성 (토큰이 없으면 None)
+# 토큰을 보냈는데 만료/폐기됐으면 401 -> 클라이언트가 재발급 후 다시 요청 (변경자가 빠지지 않도록)
+def get_audit_actor(token: Optional[str] = Depends(optional_oauth2_scheme), db: Session = Depends(database.get_db)) -> Optional[str]:
+    if not token:
+        return None
+    payload = decode_token(token, "access")
+
+    db.info[ACTOR_KEY] = payload["sub"]
+    return payload["sub"]
+
+# 관리자 전용 API 용 의존성 (HR_ADMIN_EMPLOYEE_IDS 에 있는 사번만 허용)
+def get_admin_user(current_user=Depends(get_current_user)):
+    if current_user.employee_id not in ADMIN_EMPLOYEE_IDS:
+        raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="관리자 권한이 필요합니다.")
+    return current_user
+
+# --- 5. 사원의 모든 토큰 폐기 (퇴사/분실 시) ---
+# 본인 토큰은 본인이(모든 기기에서 로그아웃), 다른 사원의 토큰은 관리자만 폐기 가능
+@router.post("/revoke/{employee_id}")
+def revoke_all_tokens(employee_id: str, current_user=Depends(get_current_user), db: Session = Depends(database.get_db)):
+    if employee_id != current_user.employee_id and current_user.employee_id not in ADMIN_EMPLOYEE_IDS:
+        raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="관리자 권한이 필요합니다.")
+
+    revocation_list.revoke(
+        db, employee_id, expires_at=datetime.utcnow() + timedelta(days=REFRESH_TOKEN_EXPIRE_DAYS)
+    )
+    return {"message": f"{employee_id} 사원의 모든 토큰이 폐기되었습니다."}
@@ -0,0 +1,61 @@
+from datetime import date, datetime
+from typing import Optional
+from fastapi import APIRouter, Depends, HTTPException
+from sqlalchemy.orm import Session
+from pydantic import BaseModel
+
+import database
+import models
+from workdays import reload_holidays
+from jobs import enqueue_after_commit
+
+router = APIRouter()
+
+def parse_date(d_str: str) -> date:
+    try:
+        return datetime.strptime(d_str, "%Y-%m-%d").date()
+    except ValueError:
+        raise HTTPException(status_code=400, detail="날짜 형식이 올바르지 않습니다. (YYYY-MM-DD)")
+
+class HolidayRequest(BaseModel):
+    holiday_date: str  # YYYY-MM-DD
+    name: str
+
+# 1. 회사 휴일 목록 조회
+@router.get("")
+def get_holidays(year: Optional[int] = None, db: Session = Depends(database.get_db)):
+    q = db.query(models.CompanyHoliday)
+    if year:
+        q = q.filter(models.CompanyHoliday.holiday_date.between(date(year, 1, 1), date(year, 12, 31)))
+
+    return [
+        {"date": str(h.holiday_date), "name": h.name}
+        for h in q.order_by(models.CompanyHoliday.holiday_date.asc()).all()
+    ]
+
+# 2. 회사 휴일 등록 (커밋 후 백그라운드에서 근무일 달력 갱신, 다른 워커는 workdays 주기 동기화로 반영)
+@router.post("")
+def create_holiday(req: HolidayRequest, db: Session = Depends(database.get_db)):
+    target = parse_date(req.holiday_date)
+
+    if db.query(models.CompanyHoliday).filter(models.CompanyHoliday.holiday_date == target).first():
+        raise HTTPException(status_code=400, detail="이미 등록된 휴일입니다.")
+
+    db.add(models.CompanyHoliday(holiday_date=target, name=req.name))
+    enqueue_after_commit(db, reload_holidays)
+    db.commit()
+    return {"message": f"{target} '{req.name}' 휴일이 등록되었습니다."}
+
+# 3. 회사 휴일 삭제
+@router.delete("/{holiday_date}")
+def delete_holiday(holiday_date: str, db: Session = Depends(database.get_db)):
+    holiday = db.query(models.CompanyHoliday).filter(
+        models.CompanyHoliday.holiday_date == parse_date(holiday_date)
+    ).first()
+    if not holiday:
+        raise HTTPException(status_code=404, detail="해당 휴일을 찾을 수 없습니다.")
+
+    db.delete(holiday)
+    enqueue_after_commit(db, reload_holidays)
+    db.commit()
+    return {"message": f"{holiday_date} 휴일이 삭제되었습니다."}
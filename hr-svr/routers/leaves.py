@@ -4,23 +4,22 @@ from sqlalchemy.orm import Session
 # [수정] 상대 경로(..) 제거 -> 루트 경로에서 바로 import
 import schemas
 import database
-import models
+import archive
 
 # [수정] 같은 폴더에 있어도 명확하게 패키지 경로로 import
 from routers.auth import get_current_user
+from workdays import work_calendar
+from directory import EmployeeRecord
 
 router = APIRouter()
 
 @router.get("/my-status", response_model=schemas.LeaveStatusResponse)
 def get_my_leave_status(
     db: Session = Depends(database.get_db),
-    current_user: models.Employee = Depends(get_current_user)
+    current_user: EmployeeRecord = Depends(get_current_user)
 ):
-    # 1. 로그인한 사원(current_user)의 '승인'된 신청 내역만 가져오기
-    applications = db.query(models.ApplicationModel).filter(
-        models.ApplicationModel.employee_id == current_user.employee_id,
-        models.ApplicationModel.status == "승인"
-    ).all()
+    # 1. 로그인한 사원(current_user)의 '승인'된 신청 내역만 가져오기 (아카이브된 지난 연도 포함)
+    applications = archive.employee_applications(db, current_user.employee_id, status="승인")
 
     # 2. 휴가 사용량 계산하기
     used_annual = 0.0  # 연차 (반차 포함)
@@ -29,18 +28,15 @@ def get_my_leave_status(
     used_public = 0.0  # 공가
 
     for app in applications:
-        # 날짜 차이 구하기 (종료일 - 시작일 + 1)
-        duration = (app.end_date - app.start_date).days + 1
-        if duration < 1: duration = 1.0
+        # 주말/공휴일을 제외한 근무일 수 (반차는 0.5일)
+        duration = work_calendar.leave_days(app.start_date, app.end_date, app.application_type)
 
-        if app.application_type == "연차":
-            used_annual += float(duration)
-        elif app.application_type in ["오전 반차", "오후 반차"]:
-            used_annual += 0.5  # 반차는 0.5일
+        if app.application_type in ["연차", "오전 반차", "오후 반차"]:
+            used_annual += duration
         elif app.application_type == "병가":
-            used_sick += float(duration)
+            used_sick += duration
         elif app.application_type == "경조사 휴가":
-            used_event += float(duration)
+            used_event += duration
         # 공가 등 다른 타입이 있다면 여기에 추가
 
     # 3. 사원의 총 연차 일수 가져오기 (DB에 없으면 기본 15일)
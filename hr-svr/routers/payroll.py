@@ -0,0 +1,48 @@
+from fastapi import APIRouter, Depends, HTTPException
+from sqlalchemy.orm import Session
+
+import database
+import models
+from month_close import row_checksum
+
+router = APIRouter()
+
+def to_dict(snap: models.PayrollSnapshot) -> dict:
+    row = {
+        "employee_id": snap.employee_id,
+        "work_minutes": snap.work_minutes,
+        "overtime_minutes": snap.overtime_minutes,
+        "absence_days": snap.absence_days,
+        "leave_days": snap.leave_days,
+    }
+    return {
+        **row,
+        "period": snap.period,
+        "closed_at": snap.closed_at.strftime("%Y-%m-%d %H:%M:%S"),
+        "checksum": snap.checksum,
+        # 저장된 값이 마감 당시와 같은지 체크섬으로 확인
+        "verified": row_checksum(snap.period, row) == snap.checksum,
+    }
+
+# 1. 월 마감 스냅샷 전체 조회 (급여 정산용)
+@router.get("/{period}")
+def get_payroll_snapshot(period: str, db: Session = Depends(database.get_db)):
+    snaps = db.query(models.PayrollSnapshot).filter(
+        models.PayrollSnapshot.period == period
+    ).order_by(models.PayrollSnapshot.employee_id.asc()).all()
+
+    if not snaps:
+        raise HTTPException(status_code=404, detail=f"{period} 월 마감 데이터가 없습니다.")
+    return [to_dict(s) for s in snaps]
+
+# 2. 사원 한 명의 월 마감 스냅샷 조회
+@router.get("/{period}/{employee_id}")
+def get_employee_payroll_snapshot(period: str, employee_id: str, db: Session = Depends(database.get_db)):
+    snap = db.query(models.PayrollSnapshot).filter(
+        models.PayrollSnapshot.period == period,
+        models.PayrollSnapshot.employee_id == employee_id
+    ).first()
+
+    if not snap:
+        raise HTTPException(status_code=404, detail=f"{period} 월 마감 데이터가 없습니다.")
+    return to_dict(snap)
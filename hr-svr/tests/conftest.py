@@ -0,0 +1,57 @@
+import os
+import shutil
+import sys
+import tempfile
+import time
+
+import pytest
+
+# 테스트는 SQLite 파일 DB 로 실행 (모듈이 import 시점에 환경변수를 읽으므로 가장 먼저 설정)
+_TMP_DIR = tempfile.mkdtemp(prefix="hr-test-")
+os.environ.update({
+    "HR_DB_BACKEND": "sqlite",
+    "HR_SQLITE_PATH": os.path.join(_TMP_DIR, "hr.db"),
+    "HR_ARCHIVE_DIR": os.path.join(_TMP_DIR, "archive"),
+    "HR_AUDIT_SPOOL": os.path.join(_TMP_DIR, "audit_spool.jsonl"),
+    "HR_ADMIN_EMPLOYEE_IDS": "admin",
+})
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import bootstrap  # noqa: E402
+import database  # noqa: E402
+import models  # noqa: E402
+
+
+@pytest.fixture(scope="session", autouse=True)
+def schema():
+    bootstrap.ensure_schema()
+
+
+@pytest.fixture
+def db():
+    """테스트마다 빈 테이블/빈 아카이브로 시작 (스키마 버전 기록은 유지)"""
+    shutil.rmtree(os.environ["HR_ARCHIVE_DIR"], ignore_errors=True)
+    with database.engine.begin() as conn:
+        for table in reversed(models.Base.metadata.sorted_tables):
+            if table.name != "schema_version":
+                conn.execute(table.delete())
+    session = database.SessionLocal()
+    yield session
+    session.close()
+
+
+@pytest.fixture
+def client(db):
+    from fastapi.testclient import TestClient
+    import admission
+    import main
+
+    # 모든 요청이 같은 IP 로 들어오므로 테스트끼리 속도 제한 토큰을 나눠 쓰지 않도록 비움
+    admission.rate_limiter._buckets.clear()
+
+    with TestClient(main.app) as c:
+        deadline = time.monotonic() + 10
+        while not bootstrap.readiness.ready and time.monotonic() < deadline:
+            time.sleep(0.02)
+        assert bootstrap.readiness.ready, bootstrap.readiness.to_dict()
+        yield c
@@ -0,0 +1,96 @@
+import asyncio
+
+import pytest
+
+import admission
+from admission import AdmissionController, RateLimiter, classify
+
+
+def test_classify_routes():
+    assert classify("POST", "/api/attendance/clock-in") == "critical"
+    assert classify("GET", "/api/attendance/clock-in") == "interactive"
+    assert classify("GET", "/api/payroll/2026-09") == "report"
+    assert classify("GET", "/api/dashboard/summary/e1") == "interactive"
+
+
+def test_rate_limiter_allows_burst_then_asks_to_wait(monkeypatch):
+    now = [1000.0]
+    monkeypatch.setattr(admission.time, "monotonic", lambda: now[0])
+    limiter = RateLimiter()
+
+    assert [limiter.take("critical:employee", "e1", 1.0, 3) for _ in range(3)] == [0.0, 0.0, 0.0]
+    wait = limiter.take("critical:employee", "e1", 1.0, 3)
+    assert 0 < wait <= 1.0
+
+    # 다른 키는 영향 없음, 시간이 지나면 다시 보충
+    assert limiter.take("critical:employee", "e2", 1.0, 3) == 0.0
+    now[0] += 1.0
+    assert limiter.take("critical:employee", "e1", 1.0, 3) == 0.0
+
+
+@pytest.fixture
+def limits(monkeypatch):
+    monkeypatch.setattr(admission, "GLOBAL_LIMIT", 2)
+    monkeypatch.setattr(admission, "CLASS_LIMITS", {
+        "critical": {"max_concurrent": 2, "max_queue": 10, "queue_timeout": 1.0, "global_share": 1.0},
+        "interactive": {"max_concurrent": 2, "max_queue": 10, "queue_timeout": 1.0, "global_share": 1.0},
+        "report": {"max_concurrent": 1, "max_queue": 1, "queue_timeout": 0.05, "global_share": 0.5},
+    })
+
+
+def test_report_class_is_capped_and_shed_when_queue_is_full(limits):
+    async def scenario():
+        ctl = AdmissionController()
+        assert await ctl.acquire("report")
+        # report 는 전체 한도의 절반(1) 만 사용 -> 두 번째는 대기 후 시간 초과, 세 번째는 대기열 초과로 즉시 거절
+        waiting = asyncio.ensure_future(ctl.acquire("report"))
+        await asyncio.sleep(0)
+        assert not await ctl.acquire("report")
+        assert not await waiting
+        assert ctl.stats["report"]["shed"] == 2
+        ctl.release("report")
+        assert ctl.inflight == 0
+
+    asyncio.run(scenario())
+
+
+def test_release_wakes_higher_priority_first(limits):
+    async def scenario():
+        ctl = AdmissionController()
+        assert await ctl.acquire("interactive")
+        assert await ctl.acquire("interactive")
+
+        order = []
+
+        async def wait_for(cls):
+            assert await ctl.acquire(cls)
+            order.append(cls)
+
+        tasks = [asyncio.ensure_future(wait_for("interactive")), asyncio.ensure_future(wait_for("critical"))]
+        await asyncio.sleep(0)
+        # 자리가 하나 나면 먼저 줄 선 interactive 가 아니라 critical 이 받음
+        ctl.release("interactive")
+        assert ctl.class_inflight["critical"] == 1
+        assert len(ctl._waiters["interactive"]) == 1
+
+        ctl.release("interactive")
+        await asyncio.gather(*tasks)
+        assert order == ["critical", "interactive"]
+        assert ctl.inflight == 2
+
+    asyncio.run(scenario())
+
+
+def test_spoofed_employee_id_does_not_drain_victim_bucket():
+    from jose import jwt
+
+    forged = jwt.encode({"sub": "victim", "type": "access"}, "not-the-secret", algorithm="HS256")
+    assert admission._bearer_subject({b"authorization": f"Bearer {forged}".encode()}) is None
+
+
+def test_verified_token_uses_employee_bucket():
+    from routers.auth import create_token_pair
+
+    token = create_token_pair("e1")["access_token"]
+    assert admission._bearer_subject({b"authorization": f"Bearer {token}".encode()}) == "e1"
+    assert admission._bearer_subject({}) is None
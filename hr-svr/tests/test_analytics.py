@@ -0,0 +1,73 @@
+from datetime import date, time as dtime
+
+import archive
+import models
+from routers.analytics import week_of, weekly_cache
+
+URL = "/api/analytics/attendance/departments"
+WEEK = {"start": "2025-09-01", "end": "2025-09-07"}
+
+
+def seed(db):
+    db.add(models.Employee(employee_id="e1", name="가", password="x", department="개발"))
+    db.add(models.Employee(employee_id="e2", name="나", password="x", department="개발"))
+    db.add(models.Employee(employee_id="e3", name="다", password="x", department="영업"))
+    db.add(models.Attendance(attendance_id="A1", employee_id="e1", attendance_date=date(2025, 9, 1),
+                             attendance_in_time=dtime(9, 30), attendance_out_time=dtime(18, 0)))
+    db.add(models.Attendance(attendance_id="A2", employee_id="e2", attendance_date=date(2025, 9, 2),
+                             attendance_in_time=dtime(8, 50), attendance_out_time=dtime(19, 0)))
+    db.add(models.Attendance(attendance_id="A3", employee_id="e3", attendance_date=date(2025, 9, 3),
+                             attendance_in_time=dtime(8, 0), attendance_out_time=None))
+    db.commit()
+    weekly_cache.clear()
+
+
+def by_dept(res) -> dict:
+    assert res.status_code == 200
+    return {row["department"]: row for row in res.json()}
+
+
+def test_department_bucket_values(client, db):
+    seed(db)
+    rows = by_dept(client.get(URL, params=WEEK))
+
+    dev = rows["개발"]
+    assert (dev["records"], dev["lateCount"], dev["lateRate"]) == (2, 1, 0.5)
+    assert dev["avgWorkHours"] == round((8.5 + 10 + 10 / 60) / 2, 2)
+    assert dev["overtimeHours"] == 1.0
+
+    sales = rows["영업"]
+    assert (sales["records"], sales["lateCount"], sales["avgWorkHours"]) == (1, 0, 0.0)
+
+
+def test_archived_week_matches_hot_week(client, db):
+    seed(db)
+    before = client.get(URL, params=WEEK).json()
+    archive.archive_year(db, "attendance", 2025)
+    weekly_cache.clear()
+    assert client.get(URL, params=WEEK).json() == before
+
+
+def test_commit_invalidates_cached_week(client, db):
+    seed(db)
+    by_dept(client.get(URL, params=WEEK))
+    assert weekly_cache.get(week_of(date(2025, 9, 1))) is not None
+
+    db.get(models.Attendance, "A1").attendance_in_time = dtime(8, 55)
+    db.commit()
+    assert by_dept(client.get(URL, params=WEEK))["개발"]["lateCount"] == 0
+
+    # 부서 이동은 그 사원이 있던 모든 주에 영향 -> 전체 비움
+    db.get(models.Employee, "e3").department = "개발"
+    db.commit()
+    rows = by_dept(client.get(URL, params=WEEK))
+    assert "영업" not in rows and rows["개발"]["records"] == 3
+
+
+def test_rolled_back_change_keeps_cache(client, db):
+    seed(db)
+    by_dept(client.get(URL, params=WEEK))
+    db.get(models.Attendance, "A1").attendance_in_time = dtime(8, 55)
+    db.flush()
+    db.rollback()
+    assert weekly_cache.get(week_of(date(2025, 9, 1))) is not None
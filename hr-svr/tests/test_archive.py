@@ -0,0 +1,66 @@
+from datetime import date, datetime, time as dtime
+
+import pyarrow.parquet as pq
+
+import archive
+import models
+
+
+def add_attendance(db, att_id, day, employee_id="e1"):
+    db.add(models.Attendance(attendance_id=att_id, employee_id=employee_id, attendance_date=day,
+                             attendance_in_time=dtime(9, 0), attendance_out_time=dtime(18, 0)))
+
+
+def add_application(db, app_id, start, status="승인", app_type="연차", employee_id="e1"):
+    db.add(models.ApplicationModel(application_id=app_id, employee_id=employee_id, application_type=app_type,
+                                   start_date=start, end_date=start, status=status, created_at=start))
+
+
+def test_archive_round_trip(db):
+    add_attendance(db, "A1", date(2025, 3, 4))
+    add_attendance(db, "A2", date(2025, 12, 31))
+    add_attendance(db, "A3", date(2026, 1, 2))
+    db.commit()
+
+    assert archive.archive_year(db, "attendance", 2025) == 2
+    assert [a.attendance_id for a in db.query(models.Attendance).all()] == ["A3"]
+
+    rows = archive.read_attendance(date(2025, 3, 1), date(2025, 3, 31), "e1")
+    assert [(r.attendance_id, r.attendance_date, r.attendance_in_time) for r in rows] == [("A1", date(2025, 3, 4), dtime(9, 0))]
+
+
+def test_rearchive_merges_without_duplicates(db):
+    add_attendance(db, "A1", date(2025, 3, 4))
+    db.commit()
+    archive.archive_year(db, "attendance", 2025)
+
+    # 지난번 실행이 파일 교체 후 삭제에 실패한 상황 + 늦게 들어온 행
+    add_attendance(db, "A1", date(2025, 3, 4))
+    add_attendance(db, "A2", date(2025, 6, 1))
+    db.commit()
+    assert archive.archive_year(db, "attendance", 2025) == 2
+
+    ids = sorted(r["attendance_id"] for r in pq.read_table(archive.partition_path("attendance", 2025)).to_pylist())
+    assert ids == ["A1", "A2"]
+    assert db.query(models.Attendance).count() == 0
+
+
+def test_pending_applications_stay_hot(db):
+    add_application(db, "P1", datetime(2025, 12, 29), status="대기")
+    add_application(db, "P2", datetime(2025, 12, 30), status="승인")
+    db.commit()
+
+    assert archive.archive_year(db, "applications", 2025) == 1
+    assert [a.application_id for a in db.query(models.ApplicationModel).all()] == ["P1"]
+
+
+def test_leave_balance_survives_archiving(client, db):
+    db.add(models.Employee(employee_id="e1", name="가", password="x", total_leave_days=15.0))
+    for i, day in enumerate([date(2025, 3, 4), date(2025, 3, 5), date(2025, 3, 6)]):
+        add_application(db, f"L{i}", datetime.combine(day, dtime(9, 0)))
+    db.commit()
+
+    before = client.get("/api/dashboard/summary/e1").json()["leaveBalance"]
+    archive.archive_year(db, "applications", 2025)
+    after = client.get("/api/dashboard/summary/e1").json()["leaveBalance"]
+    assert before == after == 12.0
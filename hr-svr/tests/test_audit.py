@@ -0,0 +1,113 @@
+import json
+import os
+import time
+from datetime import datetime, timedelta
+
+import audit
+import models
+from audit import AuditWriter, audit_writer
+
+
+def entry(i: int) -> dict:
+    return {
+        "occurred_at": datetime(2026, 10, 1, 9, 0) + timedelta(minutes=i),
+        "actor_id": "admin", "employee_id": "e1", "action": "update",
+        "entity": "employees", "entity_id": "e1", "changes": "{}",
+    }
+
+
+def test_commit_is_buffered_and_written_in_one_batch(db, monkeypatch):
+    batches = []
+    original = AuditWriter._insert
+    monkeypatch.setattr(AuditWriter, "_insert", lambda self, rows: (batches.append(len(rows)), original(self, rows)))
+    audit_writer.flush()
+    batches.clear()
+
+    # 라이프스팬 없이(스크립트처럼) 커밋해도 커밋 훅에서 기록하지 않으므로 멈추지 않음
+    for i in range(3):
+        db.add(models.Employee(employee_id=f"s{i}", name="배치", password="secret"))
+        db.commit()
+    assert batches == []
+
+    audit_writer.flush()
+    assert batches == [3]
+    logs = db.query(models.AuditLog).filter_by(entity="employees", action="insert").all()
+    assert len(logs) == 3
+    assert json.loads(logs[0].changes)["password"] == [None, "***"]
+
+
+def test_rollback_is_not_audited(db):
+    audit_writer.flush()
+    db.add(models.Employee(employee_id="r1", name="롤백", password="x"))
+    db.flush()
+    db.rollback()
+    audit_writer.flush()
+    assert db.query(models.AuditLog).count() == 0
+
+
+def test_writer_thread_flushes_when_batch_is_full(db, monkeypatch):
+    monkeypatch.setattr(audit, "FLUSH_BATCH_SIZE", 2)
+    monkeypatch.setattr(audit, "FLUSH_INTERVAL_SECONDS", 60)
+    w = AuditWriter()
+    w.start()
+    try:
+        w.add([entry(0), entry(1)])
+        deadline = time.monotonic() + 5
+        while db.query(models.AuditLog).count() < 2 and time.monotonic() < deadline:
+            time.sleep(0.02)
+        assert db.query(models.AuditLog).count() == 2
+    finally:
+        w.stop()
+
+
+def test_failed_insert_is_spooled_and_replayed(db, monkeypatch):
+    w = AuditWriter()
+    original = AuditWriter._insert
+
+    def down(self, rows):
+        raise RuntimeError("DB 연결 끊김")
+
+    monkeypatch.setattr(AuditWriter, "_insert", down)
+    w.add([entry(0), entry(1)])
+    w.flush()
+    assert os.path.exists(audit.SPOOL_PATH)
+    assert db.query(models.AuditLog).count() == 0
+
+    monkeypatch.setattr(AuditWriter, "_insert", original)
+    w.add([entry(2)])
+    w.flush()
+    assert not os.path.exists(audit.SPOOL_PATH)
+    assert not os.path.exists(audit.SPOOL_PATH + ".replay")
+    assert sorted(log.occurred_at.minute for log in db.query(models.AuditLog).all()) == [0, 1, 2]
+
+
+def test_audit_endpoint_requires_admin_and_pages_by_cursor(client, db):
+    for eid in ("e1", "admin"):
+        client.post("/api/auth/signup-test", json={"employee_id": eid, "password": "pw", "name": eid})
+
+    def token(eid):
+        return client.post("/api/auth/login", data={"username": eid, "password": "pw"}).json()["access_token"]
+
+    audit_writer.flush()
+    with db.begin():
+        db.query(models.AuditLog).delete()
+    AuditWriter()._insert([entry(i) for i in range(5)])
+
+    assert client.get("/api/audit").status_code == 401
+    assert client.get("/api/audit", headers={"Authorization": f"Bearer {token('e1')}"}).status_code == 403
+
+    headers = {"Authorization": f"Bearer {token('admin')}"}
+    audit_writer.flush()  # 로그인 기록은 조회 대상에서 제외
+    seen, cursor = [], None
+    while True:
+        params = {"size": 2, "action": "update"}
+        if cursor:
+            params["cursor"] = cursor
+        page = client.get("/api/audit", params=params, headers=headers).json()
+        seen += [item["occurred_at"] for item in page["items"]]
+        cursor = page["next_cursor"]
+        if not cursor:
+            break
+
+    assert len(seen) == 5
+    assert seen == sorted(seen, reverse=True)
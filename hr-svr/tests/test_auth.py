@@ -0,0 +1,37 @@
+def signup(client, employee_id):
+    client.post("/api/auth/signup-test", json={"employee_id": employee_id, "password": "pw", "name": employee_id})
+
+
+def login(client, employee_id) -> dict:
+    res = client.post("/api/auth/login", data={"username": employee_id, "password": "pw"})
+    assert res.status_code == 200
+    return res.json()
+
+
+def test_refresh_token_is_single_use(client):
+    signup(client, "e1")
+    tokens = login(client, "e1")
+
+    first = client.post("/api/auth/refresh", json={"refresh_token": tokens["refresh_token"]})
+    again = client.post("/api/auth/refresh", json={"refresh_token": tokens["refresh_token"]})
+    assert first.status_code == 200
+    assert again.status_code == 401
+
+
+def test_logout_with_refresh_token_only(client):
+    signup(client, "e1")
+    tokens = login(client, "e1")
+
+    assert client.post("/api/auth/logout", json={"refresh_token": tokens["refresh_token"]}).status_code == 200
+    assert client.post("/api/auth/refresh", json={"refresh_token": tokens["refresh_token"]}).status_code == 401
+
+
+def test_revoke_all_requires_self_or_admin(client):
+    for eid in ("e1", "e2", "admin"):
+        signup(client, eid)
+    e1 = login(client, "e1")["access_token"]
+    admin = login(client, "admin")["access_token"]
+
+    assert client.post("/api/auth/revoke/e2").status_code == 401
+    assert client.post("/api/auth/revoke/e2", headers={"Authorization": f"Bearer {e1}"}).status_code == 403
+    assert client.post("/api/auth/revoke/e2", headers={"Authorization": f"Bearer {admin}"}).status_code == 200
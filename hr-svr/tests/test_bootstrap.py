@@ -0,0 +1,87 @@
+import pytest
+from sqlalchemy import create_engine, inspect, text
+from sqlalchemy.exc import IntegrityError
+
+import bootstrap
+import database
+
+# 스키마 버전 기록이 생기기 전 (원래 main.py 의 create_all 로 만든) DB
+BASELINE_DDL = [
+    "CREATE TABLE employees (employee_id VARCHAR(50) PRIMARY KEY, name VARCHAR(100) NOT NULL, "
+    "password VARCHAR(255) NOT NULL, department VARCHAR(50), position VARCHAR(50), email VARCHAR(100), "
+    "phone_number VARCHAR(50), hire_date DATE, status VARCHAR(20), total_leave_days FLOAT)",
+    "CREATE TABLE attendance (attendance_id VARCHAR(50) PRIMARY KEY, employee_id VARCHAR(50), attendance_date DATE, "
+    "attendance_in_time TIME, attendance_out_time TIME, attendance_in_location VARCHAR(100), "
+    "attendance_out_location VARCHAR(100), attendance_method VARCHAR(50))",
+    "CREATE TABLE applications (application_id VARCHAR(50) PRIMARY KEY, employee_id VARCHAR(50), "
+    "application_type VARCHAR(50) NOT NULL, start_date DATETIME NOT NULL, end_date DATETIME NOT NULL, "
+    "reason TEXT, status VARCHAR(50), created_at TIMESTAMP)",
+    "INSERT INTO employees (employee_id, name, password, department) VALUES ('e1', '가', 'x', '개발')",
+    "INSERT INTO attendance (attendance_id, employee_id, attendance_date) VALUES ('ATT-1', 'e1', '2026-10-01')",
+]
+
+
+@pytest.fixture
+def baseline(tmp_path, monkeypatch):
+    path = tmp_path / "baseline.db"
+    engine = create_engine(f"sqlite:///{path}")
+    with engine.begin() as conn:
+        for ddl in BASELINE_DDL:
+            conn.execute(text(ddl))
+    monkeypatch.setattr(database, "engine", engine)
+    monkeypatch.setattr(database, "SQLITE_PATH", str(path))
+    yield engine
+    engine.dispose()
+
+
+def test_migrates_baseline_db_and_keeps_rows(baseline):
+    assert bootstrap.ensure_schema() is True
+
+    with baseline.connect() as conn:
+        assert bootstrap._read_schema_version(conn) == bootstrap.SCHEMA_VERSION
+        bootstrap._verify_schema(conn)  # 모델의 모든 컬럼이 있음
+        assert conn.execute(text("SELECT name FROM employees")).scalar() == "가"
+        assert conn.execute(text("SELECT updated_at FROM employees")).scalar() is not None
+
+    # 하루 한 번 출근 유니크 제약
+    with pytest.raises(IntegrityError):
+        with baseline.begin() as conn:
+            conn.execute(text(
+                "INSERT INTO attendance (attendance_id, employee_id, attendance_date) VALUES ('ATT-2', 'e1', '2026-10-01')"
+            ))
+
+    indexes = {i["name"] for i in inspect(baseline).get_indexes("token_revocations")}
+    assert {"ix_token_revocations_jti", "ix_token_revocations_revoked_at"} <= indexes
+
+
+def test_sql_update_bumps_updated_at(baseline):
+    bootstrap.ensure_schema()
+    with baseline.begin() as conn:
+        conn.execute(text("UPDATE employees SET updated_at = '2000-01-01 00:00:00'"))
+    with baseline.begin() as conn:
+        conn.execute(text("UPDATE employees SET status = '퇴사' WHERE employee_id = 'e1'"))
+        assert conn.execute(text("SELECT updated_at FROM employees")).scalar() > "2000-01-01 00:00:00"
+
+
+def test_duplicate_attendance_stops_migration(baseline):
+    with baseline.begin() as conn:
+        conn.execute(text(
+            "INSERT INTO attendance (attendance_id, employee_id, attendance_date) VALUES ('ATT-2', 'e1', '2026-10-01')"
+        ))
+    with pytest.raises(RuntimeError):
+        bootstrap.ensure_schema()
+    with baseline.connect() as conn:
+        assert bootstrap._read_schema_version(conn) < 3
+
+
+def test_current_version_skips_reflection(baseline, monkeypatch):
+    bootstrap.ensure_schema()
+
+    calls = []
+    monkeypatch.setattr(bootstrap, "_verify_schema", lambda conn: calls.append(conn))
+    assert bootstrap.ensure_schema() is False
+    assert calls == []
+
+    monkeypatch.setattr(bootstrap, "VERIFY_SCHEMA_ON_BOOT", True)
+    assert bootstrap.ensure_schema() is False
+    assert len(calls) == 1
@@ -0,0 +1,69 @@
+from datetime import datetime, timedelta
+
+from sqlalchemy import text
+
+import database
+import directory
+import models
+from directory import EmployeeDirectory, employee_directory
+
+
+def add_employee(db, employee_id, **values):
+    db.add(models.Employee(employee_id=employee_id, name=values.pop("name", employee_id), password="x", **values))
+    db.commit()
+
+
+def sql(statement: str, **params):
+    """다른 워커(또는 SQL 로 직접)에서 바꾼 상황 (이 프로세스의 세션 이벤트를 거치지 않음)"""
+    with database.engine.begin() as conn:
+        conn.execute(text(statement), params)
+
+
+def test_committed_changes_are_applied_without_reload(db):
+    employee_directory.load(db)
+    add_employee(db, "e1", department="개발")
+    assert employee_directory.get("e1").department == "개발"
+
+    db.get(models.Employee, "e1").department = "영업"
+    db.flush()
+    db.rollback()
+    assert employee_directory.get("e1").department == "개발"  # 롤백은 반영하지 않음
+
+
+def test_sync_picks_up_changes_from_other_workers(db):
+    add_employee(db, "e1", department="개발")
+    d = EmployeeDirectory()
+    d.load(db)
+
+    sql("UPDATE employees SET department = '영업' WHERE employee_id = 'e1'")
+    sql("INSERT INTO employees (employee_id, name, password) VALUES ('e2', '나', 'x')")
+    d.sync(db)
+
+    assert d.get("e1").department == "영업"
+    assert d.get("e2").name == "나"
+    assert d.search("영업") == ["e1"]
+
+
+def test_full_reload_drops_deleted_employees(db, monkeypatch):
+    add_employee(db, "e1")
+    d = EmployeeDirectory()
+    d.load(db)
+
+    sql("DELETE FROM employees WHERE employee_id = 'e1'")
+    d.sync(db)
+    assert d.get("e1") is not None  # 증분 동기화로는 삭제를 알 수 없음
+
+    d._last_full = datetime.utcnow() - timedelta(seconds=directory.FULL_RELOAD_SECONDS + 1)
+    d.sync(db)
+    assert d.get("e1") is None
+
+
+def test_termination_in_another_worker_blocks_login_after_sync(client, db):
+    client.post("/api/auth/signup-test", json={"employee_id": "e1", "password": "pw", "name": "가"})
+    token = client.post("/api/auth/login", data={"username": "e1", "password": "pw"}).json()["access_token"]
+    headers = {"Authorization": f"Bearer {token}"}
+    assert client.get("/api/leaves/my-status", headers=headers).status_code == 200
+
+    sql("UPDATE employees SET status = '퇴사' WHERE employee_id = 'e1'")
+    employee_directory.sync(db)
+    assert client.get("/api/leaves/my-status", headers=headers).status_code == 401
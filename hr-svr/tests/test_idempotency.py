@@ -0,0 +1,103 @@
+import pytest
+from starlette.applications import Starlette
+from starlette.responses import JSONResponse
+from starlette.routing import Route
+from starlette.testclient import TestClient
+
+import idempotency
+import models
+from idempotency import IN_FLIGHT, IdempotencyMiddleware, MemoryIdempotencyStore
+
+
+def test_reserve_returns_existing_record():
+    store = MemoryIdempotencyStore()
+    assert store.reserve("k", "fp") is None
+    assert store.reserve("k", "fp")["state"] == IN_FLIGHT
+
+    store.complete("k", {"state": "done", "fingerprint": "fp"})
+    assert store.reserve("k", "fp")["state"] == "done"
+
+    store.release("k")
+    assert store.reserve("k", "fp") is None
+
+
+def test_entries_expire_after_ttl(monkeypatch):
+    now = [0.0]
+    monkeypatch.setattr(idempotency.time, "monotonic", lambda: now[0])
+    store = MemoryIdempotencyStore(ttl_seconds=10)
+    store.reserve("k", "fp")
+
+    now[0] = 11.0
+    assert store.reserve("k", "fp") is None
+
+
+def test_least_recently_used_entry_is_evicted():
+    store = MemoryIdempotencyStore(max_entries=2)
+    store.reserve("a", "fp")
+    store.reserve("b", "fp")
+    store.reserve("a", "fp")  # a 를 최근 사용으로
+    store.reserve("c", "fp")  # b 가 밀려남
+
+    assert store.reserve("a", "fp") is not None
+    assert store.reserve("b", "fp") is None
+
+
+@pytest.fixture
+def app_client():
+    calls = []
+
+    async def create(request):
+        calls.append(await request.json())
+        return JSONResponse({"n": len(calls)}, status_code=201)
+
+    app = Starlette(routes=[Route("/items", create, methods=["POST"])])
+    app.add_middleware(IdempotencyMiddleware, paths=["/items"], store=MemoryIdempotencyStore())
+    return TestClient(app), calls
+
+
+def test_middleware_replays_first_response(app_client):
+    client, calls = app_client
+    first = client.post("/items", json={"a": 1}, headers={"Idempotency-Key": "k1"})
+    second = client.post("/items", json={"a": 1}, headers={"Idempotency-Key": "k1"})
+
+    assert first.status_code == second.status_code == 201
+    assert second.json() == first.json()
+    assert second.headers["idempotent-replayed"] == "true"
+    assert len(calls) == 1
+
+
+def test_middleware_rejects_key_reuse_with_different_body(app_client):
+    client, calls = app_client
+    client.post("/items", json={"a": 1}, headers={"Idempotency-Key": "k1"})
+    assert client.post("/items", json={"a": 2}, headers={"Idempotency-Key": "k1"}).status_code == 422
+    assert len(calls) == 1
+
+
+def test_requests_without_key_pass_through(app_client):
+    client, calls = app_client
+    client.post("/items", json={"a": 1})
+    client.post("/items", json={"a": 1})
+    assert len(calls) == 2
+
+
+def test_clock_in_same_second_for_different_employees(client, db):
+    for eid in ("e1", "e2"):
+        assert client.post("/api/attendance/clock-in", json={"employee_id": eid, "location": "본사"}).status_code == 200
+    assert client.post("/api/attendance/clock-in", json={"employee_id": "e2", "location": "본사"}).status_code == 400
+    assert db.query(models.Attendance).count() == 2
+
+
+def test_applications_same_second_are_all_saved(client, db):
+    body = {"application_type": "연차", "start_date": "2026-10-20", "end_date": "2026-10-20", "reason": "-"}
+    for eid in ("e1", "e2", "e3"):
+        assert client.post("/api/applications", json={**body, "employee_id": eid}).status_code == 200
+    assert db.query(models.ApplicationModel).count() == 3
+
+
+def test_retried_application_is_saved_once(client, db):
+    body = {"employee_id": "e1", "application_type": "연차", "start_date": "2026-10-20", "end_date": "2026-10-20", "reason": "-"}
+    headers = {"Idempotency-Key": "retry-1"}
+    first = client.post("/api/applications", json=body, headers=headers)
+    again = client.post("/api/applications", json=body, headers=headers)
+    assert first.status_code == again.status_code == 200
+    assert db.query(models.ApplicationModel).count() == 1
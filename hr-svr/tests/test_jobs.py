@@ -0,0 +1,107 @@
+import threading
+import time
+from datetime import date
+
+import database
+import jobs
+import models
+from jobs import JobQueue, enqueue_after_commit, job_queue
+
+
+def _insert_holiday(day: date):
+    db = database.SessionLocal()
+    try:
+        db.add(models.CompanyHoliday(holiday_date=day, name="작업"))
+        db.commit()
+    finally:
+        db.close()
+
+
+def test_commit_hook_never_runs_jobs_inline(db):
+    # 워커가 없어도 커밋 훅 안에서 실행하지 않음 (SQLite 쓰기 잠금을 들고 있어 작업이 쓰면 멈춤)
+    db.add(models.CompanyHoliday(holiday_date=date(2030, 1, 2), name="요청"))
+    enqueue_after_commit(db, _insert_holiday, date(2030, 1, 3))
+    done = threading.Event()
+    t = threading.Thread(target=lambda: (db.commit(), done.set()), daemon=True)
+    t.start()
+    assert done.wait(5), "db.commit() 이 작업 실행을 기다리며 멈춤"
+
+    assert db.query(models.CompanyHoliday).count() == 1
+    job_queue.drain()
+    assert db.query(models.CompanyHoliday).count() == 2
+
+
+def test_rollback_drops_jobs(db):
+    calls = []
+    db.add(models.CompanyHoliday(holiday_date=date(2030, 1, 2), name="요청"))
+    enqueue_after_commit(db, calls.append, 1)
+    db.rollback()
+    job_queue.drain()
+    assert calls == []
+
+
+def test_full_queue_keeps_jobs_without_running_them():
+    q = JobQueue(max_size=1, workers=1)
+    order = []
+    for i in range(3):
+        q.submit(order.append, i)
+
+    assert order == []
+    assert q.metrics()["overflow_depth"] == 2
+    q.drain()
+    assert order == [0, 1, 2]
+
+
+def test_retry_with_backoff(monkeypatch):
+    monkeypatch.setattr(jobs, "BACKOFF_SECONDS", 0.01)
+    q = JobQueue(workers=1)
+    q.start()
+    attempts = []
+
+    def flaky():
+        attempts.append(time.monotonic())
+        if len(attempts) < 3:
+            raise RuntimeError("일시 오류")
+
+    q.submit(flaky)
+    deadline = time.monotonic() + 5
+    while q.metrics()["completed"] < 1 and time.monotonic() < deadline:
+        time.sleep(0.01)
+    q.shutdown()
+
+    m = q.metrics()
+    assert (m["completed"], m["retried"], m["failed"]) == (1, 2, 0)
+    # 두 번째 재시도는 두 배 (0.02초) 기다림
+    assert attempts[2] - attempts[1] >= 0.02
+
+
+def test_shutdown_drains_remaining_jobs():
+    q = JobQueue(max_size=2, workers=1)
+    q.start()
+    done = []
+    for i in range(5):
+        q.submit(lambda i=i: (time.sleep(0.01), done.append(i)))
+    q.shutdown()
+    assert sorted(done) == [0, 1, 2, 3, 4]
+    assert q.metrics()["queue_depth"] == 0
+
+
+def test_past_attendance_edit_rebuilds_week_in_background(db):
+    from datetime import time as dtime
+    from routers.analytics import week_of, weekly_cache
+
+    day = date(2026, 3, 4)
+    db.add(models.Employee(employee_id="e1", name="가", password="x", department="개발"))
+    db.add(models.Attendance(attendance_id="A1", employee_id="e1", attendance_date=day,
+                             attendance_in_time=dtime(9, 30), attendance_out_time=dtime(18, 0)))
+    db.commit()
+    job_queue.drain()
+
+    buckets = weekly_cache.get(week_of(day))
+    assert buckets["개발"]["late"] == 1
+
+    db.get(models.Attendance, "A1").attendance_in_time = dtime(8, 50)
+    db.commit()
+    assert weekly_cache.get(week_of(day)) is None  # 커밋 즉시 비움
+    job_queue.drain()
+    assert weekly_cache.get(week_of(day))["개발"]["late"] == 0
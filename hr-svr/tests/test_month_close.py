@@ -0,0 +1,80 @@
+from datetime import date, datetime, time as dtime
+
+import pytest
+
+import archive
+import models
+import month_close
+from workdays import work_calendar
+
+
+def add_attendance(db, att_id, day, t_in, t_out, employee_id="e1"):
+    db.add(models.Attendance(attendance_id=att_id, employee_id=employee_id, attendance_date=day,
+                             attendance_in_time=t_in, attendance_out_time=t_out))
+
+
+def add_leave(db, app_id, start, end, app_type="연차", status="승인", employee_id="e1"):
+    db.add(models.ApplicationModel(application_id=app_id, employee_id=employee_id, application_type=app_type,
+                                   start_date=start, end_date=end, status=status, created_at=start))
+
+
+@pytest.fixture
+def no_company_holidays():
+    work_calendar.set_holidays([])
+
+
+def test_compute_shard_totals(db, no_company_holidays):
+    add_attendance(db, "A1", date(2025, 9, 3), dtime(9, 0), dtime(18, 0))
+    add_attendance(db, "A2", date(2025, 9, 4), dtime(9, 0), dtime(20, 30))
+    add_leave(db, "L1", datetime(2025, 9, 10, 9), datetime(2025, 9, 10, 18))
+    add_leave(db, "L2", datetime(2025, 9, 11, 9), datetime(2025, 9, 11, 13), app_type="오전 반차")
+    add_leave(db, "L3", datetime(2025, 9, 12, 9), datetime(2025, 9, 12, 18), status="반려")
+    # 지난달에 시작해 이번 달까지 이어지는 휴가 (아카이브로 옮겨진 뒤에도 이번 달 부분만 반영)
+    add_leave(db, "L4", datetime(2025, 8, 29, 9), datetime(2025, 9, 2, 18))
+    db.commit()
+    archive.archive_year(db, "applications", 2025)
+
+    [row] = month_close.compute_shard(db, "2025-09", ["e1"])
+
+    month_workdays = work_calendar.count_workdays(date(2025, 9, 1), date(2025, 9, 30))
+    assert row["work_minutes"] == 9 * 60 + 11 * 60 + 30
+    assert row["overtime_minutes"] == 150
+    assert row["leave_days"] == 1 + 0.5 + 2
+    # 출근 2일 + 하루 단위 휴가 3일 (반차는 결근에서 빼지 않음)
+    assert row["absence_days"] == month_workdays - 2 - 3
+    assert row["checksum"] == month_close.row_checksum("2025-09", row)
+
+
+def test_finished_shard_is_skipped_on_restart(db, no_company_holidays):
+    db.add(models.Employee(employee_id="e1", name="가", password="x"))
+    add_attendance(db, "A1", date(2025, 9, 3), dtime(9, 0), dtime(18, 0))
+    db.commit()
+
+    assert month_close.close_shard("2025-09", 0, 1, ["e1"]) == (0, 1)
+    # 마감 후 기록이 바뀌어도 다시 돌리면 완료된 샤드는 건너뛰고 스냅샷은 그대로
+    add_attendance(db, "A2", date(2025, 9, 4), dtime(9, 0), dtime(18, 0))
+    db.commit()
+    assert month_close.close_shard("2025-09", 0, 1, ["e1"]) == (0, 0)
+
+    snapshot = db.query(models.PayrollSnapshot).filter_by(period="2025-09", employee_id="e1").one()
+    assert snapshot.work_minutes == 9 * 60
+
+
+def test_run_month_close_resumes_with_remaining_shards(db, no_company_holidays):
+    ids = [f"e{i}" for i in range(6)]
+    for eid in ids:
+        db.add(models.Employee(employee_id=eid, name=eid, password="x"))
+    db.commit()
+
+    shard_0 = [eid for eid in ids if month_close.shard_of(eid, 2) == 0]
+    month_close.close_shard("2025-09", 0, 2, shard_0)  # 중간에 멈춘 마감
+
+    # 샤드 수를 바꿔서 다시 돌려도 이전 샤드 수로 이어서 남은 샤드만 처리
+    report = month_close.run_month_close("2025-09", workers=1, shard_count=4)
+    assert report["employees"] == len(ids) - len(shard_0)
+    assert db.query(models.PayrollSnapshot).filter_by(period="2025-09").count() == len(ids)
+
+
+def test_month_close_rejects_unfinished_month():
+    with pytest.raises(ValueError):
+        month_close.run_month_close(date.today().strftime("%Y-%m"))
@@ -0,0 +1,93 @@
+from datetime import datetime, timedelta
+import uuid
+
+import models
+from revocation import BloomFilter, RevocationList, SYNC_OVERLAP_SECONDS, to_epoch
+
+
+def test_bloom_filter_has_no_false_negatives_and_few_false_positives():
+    bloom = BloomFilter(capacity=2000, error_rate=0.01)
+    added = [uuid.uuid4().hex for _ in range(2000)]
+    for key in added:
+        bloom.add(key)
+
+    assert all(key in bloom for key in added)
+    false_positives = sum(1 for _ in range(5000) if uuid.uuid4().hex in bloom)
+    assert false_positives / 5000 < 0.03
+
+
+def test_revoke_single_token(db):
+    rl = RevocationList()
+    assert rl.revoke(db, "e1", jti="abc") is True
+    assert rl.is_revoked("abc", "e1", issued_at=0)
+    assert not rl.is_revoked("other", "e1", issued_at=0)
+
+
+def test_duplicate_jti_is_rejected_by_the_database(db):
+    # 다른 워커를 흉내: 메모리 목록이 서로 다른 두 인스턴스가 같은 리프레시 토큰을 폐기
+    assert RevocationList().revoke(db, "e1", jti="refresh-1") is True
+    assert RevocationList().revoke(db, "e1", jti="refresh-1") is False
+    assert db.query(models.TokenRevocation).filter_by(jti="refresh-1").count() == 1
+
+
+def test_revoke_all_covers_tokens_issued_in_the_same_second(db):
+    rl = RevocationList()
+    rl.revoke(db, "e1")
+    row = db.query(models.TokenRevocation).filter_by(employee_id="e1").one()
+    cutoff = to_epoch(row.revoked_at)
+
+    assert rl.is_revoked(None, "e1", issued_at=cutoff)
+    assert rl.is_revoked("any", "e1", issued_at=cutoff - 60)
+    assert not rl.is_revoked("any", "e1", issued_at=cutoff + 1)
+    assert not rl.is_revoked("any", "e2", issued_at=cutoff - 60)
+
+
+def test_incremental_sync_picks_up_rows_committed_late(db):
+    rl = RevocationList()
+    rl.sync(db)  # 첫 동기화는 전체 적재
+
+    # 지난 동기화보다 이른 revoked_at 으로 늦게 커밋된 행 (auto-increment 순서와 무관하게 읽혀야 함)
+    db.add(models.TokenRevocation(
+        jti="late", employee_id="e1",
+        revoked_at=datetime.utcnow() - timedelta(seconds=SYNC_OVERLAP_SECONDS // 2),
+        expires_at=datetime.utcnow() + timedelta(days=1),
+    ))
+    db.commit()
+    rl.sync(db)
+    assert rl.is_revoked("late", "e1", issued_at=0)
+
+
+def test_full_sync_drops_expired_rows(db):
+    db.add(models.TokenRevocation(
+        jti="expired", employee_id="e1",
+        revoked_at=datetime.utcnow() - timedelta(days=2),
+        expires_at=datetime.utcnow() - timedelta(days=1),
+    ))
+    db.commit()
+    rl = RevocationList()
+    rl.sync(db)
+    assert not rl.is_revoked("expired", "e1", issued_at=0)
+
+
+def test_full_reload_never_exposes_an_empty_list(db, monkeypatch):
+    import revocation
+
+    rl = RevocationList()
+    rl.revoke(db, "e1", jti="kept")
+    rl.revoke(db, "e2")
+    cutoff = to_epoch(db.query(models.TokenRevocation).filter_by(employee_id="e2").one().revoked_at)
+
+    seen = []
+
+    class WatchingBloom(BloomFilter):
+        def add(self, key):
+            # 전체 다시 적재 도중에 다른 요청이 확인하는 상황
+            seen.append((rl.is_revoked("kept", "e1", issued_at=0), rl.is_revoked(None, "e2", issued_at=cutoff)))
+            super().add(key)
+
+    monkeypatch.setattr(revocation, "BloomFilter", WatchingBloom)
+    rl._last_full = None  # 다음 sync 를 전체 다시 적재로
+    rl.sync(db)
+
+    assert seen and all(a and b for a, b in seen)
+    assert rl.is_revoked("kept", "e1", issued_at=0)
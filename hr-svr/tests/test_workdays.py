@@ -0,0 +1,90 @@
+from datetime import date, datetime, timedelta
+
+import pytest
+
+from workdays import WorkCalendar
+
+
+def naive_count(cal: WorkCalendar, start: date, end: date) -> int:
+    days = (end - start).days + 1
+    return sum(1 for i in range(max(days, 0)) if cal.is_workday(start + timedelta(days=i)))
+
+
+@pytest.mark.parametrize("start, end", [
+    (date(2025, 12, 29), date(2026, 1, 2)),   # 연말연시 (신정 포함)
+    (date(2023, 11, 15), date(2026, 2, 10)),  # 중간 연도 전체 포함
+    (date(2024, 12, 31), date(2025, 1, 1)),
+    (date(2026, 3, 2), date(2026, 3, 2)),
+])
+def test_count_workdays_across_years_matches_day_by_day(start, end):
+    cal = WorkCalendar(holidays=[date(2026, 1, 2), date(2024, 2, 9)])
+    assert cal.count_workdays(start, end) == naive_count(cal, start, end)
+
+
+def test_leap_year_includes_feb_29_and_dec_31():
+    cal = WorkCalendar()
+    assert cal.count_workdays(date(2024, 2, 29), date(2024, 2, 29)) == 1  # 목요일
+    assert cal.count_workdays(date(2024, 2, 28), date(2024, 3, 1)) == 2   # 3/1 삼일절
+    assert cal.count_workdays(date(2024, 12, 31), date(2024, 12, 31)) == 1
+    assert cal.count_workdays(date(2024, 1, 1), date(2024, 12, 31)) == naive_count(cal, date(2024, 1, 1), date(2024, 12, 31))
+
+
+def test_holiday_on_weekend_is_not_subtracted_twice():
+    cal = WorkCalendar()
+    # 2026-03-01 (삼일절) 은 일요일 -> 그 주 근무일은 그대로 5일
+    assert cal.count_workdays(date(2026, 2, 23), date(2026, 3, 1)) == 5
+
+    # 토요일에 회사 휴일을 등록해도 달라지지 않고, 평일 휴일만 빠짐
+    cal.set_holidays([date(2026, 3, 7), date(2026, 3, 4)])
+    assert cal.count_workdays(date(2026, 3, 2), date(2026, 3, 8)) == 4
+
+
+def test_set_holidays_rebuilds_cached_prefix():
+    cal = WorkCalendar()
+    assert cal.count_workdays(date(2026, 9, 24), date(2026, 9, 25)) == 2
+    cal.set_holidays([date(2026, 9, 24), date(2026, 9, 25)])  # 추석 연휴
+    assert cal.count_workdays(date(2026, 9, 24), date(2026, 9, 25)) == 0
+
+
+def test_end_before_start_is_zero():
+    assert WorkCalendar().count_workdays(date(2026, 5, 10), date(2026, 5, 1)) == 0
+
+
+def test_leave_days_half_day_and_datetime_arguments():
+    cal = WorkCalendar()
+    assert cal.leave_days(datetime(2026, 5, 11, 9), datetime(2026, 5, 11, 13), "오전 반차") == 0.5
+    assert cal.leave_days(datetime(2026, 5, 11, 14), datetime(2026, 5, 11, 18), "오후 반차") == 0.5
+    # 5/4(월) ~ 5/8(금), 5/5 어린이날 제외
+    assert cal.leave_days(datetime(2026, 5, 4), datetime(2026, 5, 8, 18), "연차") == 4.0
+
+
+def test_set_holidays_reports_whether_anything_changed():
+    cal = WorkCalendar(holidays=[date(2026, 9, 24)])
+    cal.count_workdays(date(2026, 9, 1), date(2026, 9, 30))
+    assert cal.set_holidays([date(2026, 9, 24)]) is False
+    assert cal._prefix  # 같은 목록이면 누적합 캐시를 버리지 않음
+    assert cal.set_holidays([date(2026, 9, 25)]) is True
+
+
+def test_holidays_added_by_another_worker_are_synced(db, monkeypatch):
+    import time
+
+    import database
+    import models
+    import workdays
+
+    monkeypatch.setattr(workdays, "SYNC_INTERVAL_SECONDS", 0.05)
+    workdays.reload_holidays()
+    workdays.start_sync()
+    try:
+        # 다른 워커가 등록한 휴일 (이 프로세스의 API 를 거치지 않음)
+        with database.engine.begin() as conn:
+            conn.execute(models.CompanyHoliday.__table__.insert(), {"holiday_date": date(2026, 9, 24), "name": "추석"})
+
+        deadline = time.monotonic() + 5
+        while workdays.work_calendar.is_workday(date(2026, 9, 24)) and time.monotonic() < deadline:
+            time.sleep(0.02)
+        assert not workdays.work_calendar.is_workday(date(2026, 9, 24))
+    finally:
+        workdays.stop_sync()
+        workdays.work_calendar.set_holidays([])
@@ -0,0 +1,159 @@
+from datetime import date, datetime, timedelta
+from typing import Dict, Iterable, List, Union
+import calendar
+import logging
+import os
+import threading
+
+from sqlalchemy.orm import Session
+
+import database
+import models
+
+logger = logging.getLogger(__name__)
+
+# ==========================================
+#  근무일(영업일) 계산 엔진
+# ==========================================
+# 연도별로 "1월 1일부터 n일째까지의 근무일 수" 누적합 배열을 만들어 두고,
+# 임의 기간의 근무일 수를 배열 두 칸의 차이로 바로 구합니다. (날짜 루프 없음)
+
+# 매년 날짜가 고정된 법정 공휴일 (음력 공휴일/대체공휴일은 company_holidays 테이블에 등록)
+FIXED_HOLIDAYS = {
+    (1, 1): "신정",
+    (3, 1): "삼일절",
+    (5, 5): "어린이날",
+    (6, 6): "현충일",
+    (8, 15): "광복절",
+    (10, 3): "개천절",
+    (10, 9): "한글날",
+    (12, 25): "성탄절",
+}
+
+HALF_DAY_TYPES = ["오전 반차", "오후 반차"]
+
+# 다른 워커에서 등록/삭제한 휴일을 반영하는 주기 (휴일 테이블은 작으므로 전체를 다시 읽음)
+SYNC_INTERVAL_SECONDS = int(os.getenv("HR_HOLIDAY_SYNC_SECONDS", 60))
+
+DateLike = Union[date, datetime]
+
+
+def _as_date(value: DateLike) -> date:
+    return value.date() if isinstance(value, datetime) else value
+
+
+class WorkCalendar:
+    def __init__(self, holidays: Iterable[date] = ()):
+        self._lock = threading.Lock()
+        self._holidays = set(holidays)
+        self._prefix: Dict[int, List[int]] = {}
+
+    def set_holidays(self, holidays: Iterable[date]) -> bool:
+        """회사 휴일 목록 교체 (누적합 캐시도 함께 초기화). 바뀐 것이 없으면 그대로 두고 False"""
+        holidays = set(holidays)
+        with self._lock:
+            if holidays == self._holidays:
+                return False
+            self._holidays = holidays
+            self._prefix = {}
+        return True
+
+    def is_holiday(self, d: DateLike) -> bool:
+        d = _as_date(d)
+        return d in self._holidays or (d.month, d.day) in FIXED_HOLIDAYS
+
+    def is_workday(self, d: DateLike) -> bool:
+        d = _as_date(d)
+        return d.weekday() < 5 and not self.is_holiday(d)
+
+    def _year_prefix(self, year: int) -> List[int]:
+        prefix = self._prefix.get(year)
+        if prefix is not None:
+            return prefix
+
+        with self._lock:
+            prefix = self._prefix.get(year)
+            if prefix is None:
+                days_in_year = 366 if calendar.isleap(year) else 365
+                first = date(year, 1, 1)
+                prefix = [0] * (days_in_year + 1)
+                for i in range(days_in_year):
+                    prefix[i + 1] = prefix[i] + (1 if self.is_workday(first + timedelta(days=i)) else 0)
+                self._prefix[year] = prefix
+        return prefix
+
+    def _count_until(self, d: date) -> int:
+        """해당 연도 1월 1일 ~ d (포함) 까지의 근무일 수"""
+        return self._year_prefix(d.year)[d.timetuple().tm_yday]
+
+    def count_workdays(self, start: DateLike, end: DateLike) -> int:
+        """start ~ end (양끝 포함) 기간의 근무일 수"""
+        start, end = _as_date(start), _as_date(end)
+        if end < start:
+            return 0
+
+        # start 전날까지의 누적값
+        before_start = self._year_prefix(start.year)[start.timetuple().tm_yday - 1]
+        if start.year == end.year:
+            return self._count_until(end) - before_start
+
+        total = self._year_prefix(start.year)[-1] - before_start
+        for year in range(start.year + 1, end.year):
+            total += self._year_prefix(year)[-1]
+        return total + self._count_until(end)
+
+    def leave_days(self, start: DateLike, end: DateLike, application_type: str) -> float:
+        """신청서 한 건이 차감하는 휴가 일수 (반차는 0.5일)"""
+        if application_type in HALF_DAY_TYPES:
+            return 0.5
+        return float(self.count_workdays(start, end))
+
+
+# 앱 전체에서 공유하는 달력
+work_calendar = WorkCalendar()
+
+
+def load_holidays(db: Session):
+    """company_holidays 테이블을 읽어 공유 달력에 반영"""
+    rows = db.query(models.CompanyHoliday.holiday_date).all()
+    if work_calendar.set_holidays(r.holiday_date for r in rows):
+        logger.info("회사 휴일 %d건 로드 완료", len(rows))
+
+
+def reload_holidays():
+    """요청 세션과 별개로 휴일을 다시 읽음 (백그라운드 작업용)"""
+    db = database.SessionLocal()
+    try:
+        load_holidays(db)
+    finally:
+        db.close()
+
+
+# --- 주기 동기화 스레드 (다른 워커에서 바꾼 휴일 반영) ---
+
+_stop = threading.Event()
+_thread = None
+
+
+def _sync_loop():
+    while not _stop.wait(SYNC_INTERVAL_SECONDS):
+        try:
+            reload_holidays()
+        except Exception as e:
+            logger.warning("회사 휴일 동기화 실패: %s", e)
+
+
+def start_sync():
+    global _thread
+    if _thread is None:
+        _stop.clear()
+        _thread = threading.Thread(target=_sync_loop, name="hr-holiday-sync", daemon=True)
+        _thread.start()
+
+
+def stop_sync():
+    global _thread
+    _stop.set()
+    if _thread is not None:
+        _thread.join(timeout=SYNC_INTERVAL_SECONDS)
+        _thread = None